@@ -133,6 +133,7 @@ register(
 register(
     id="FrozenLake-v1",
     entry_point="gymnasium.envs.toy_text.frozen_lake:FrozenLakeEnv",
+    vector_entry_point="gymnasium.envs.toy_text.frozen_lake:FrozenLakeVectorEnv",
     kwargs={"map_name": "4x4"},
     max_episode_steps=100,
     reward_threshold=0.70,  # optimum = 0.74
@@ -141,6 +142,7 @@ register(
 register(
     id="FrozenLake8x8-v1",
     entry_point="gymnasium.envs.toy_text.frozen_lake:FrozenLakeEnv",
+    vector_entry_point="gymnasium.envs.toy_text.frozen_lake:FrozenLakeVectorEnv",
     kwargs={"map_name": "8x8"},
     max_episode_steps=200,
     reward_threshold=0.85,  # optimum = 0.91
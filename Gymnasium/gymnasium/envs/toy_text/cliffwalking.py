@@ -7,7 +7,7 @@ import numpy as np
 
 import gymnasium as gym
 from gymnasium import Env, spaces
-from gymnasium.envs.toy_text.utils import categorical_sample
+from gymnasium.envs.toy_text.utils import TabularMDP, categorical_sample
 from gymnasium.error import DependencyNotInstalled
 
 
@@ -115,14 +115,16 @@ class CliffWalkingEnv(Env):
         self._cliff[3, 1:-1] = True
 
         # Calculate transition probabilities and rewards
-        self.P = {}
+        outcomes = []
         for s in range(self.nS):
             position = np.unravel_index(s, self.shape)
-            self.P[s] = {a: [] for a in range(self.nA)}
-            self.P[s][UP] = self._calculate_transition_prob(position, UP)
-            self.P[s][RIGHT] = self._calculate_transition_prob(position, RIGHT)
-            self.P[s][DOWN] = self._calculate_transition_prob(position, DOWN)
-            self.P[s][LEFT] = self._calculate_transition_prob(position, LEFT)
+            for a in (UP, RIGHT, DOWN, LEFT):
+                outcomes.extend(
+                    (s, a, *outcome)
+                    for outcome in self._calculate_transition_prob(position, a)
+                )
+        self.mdp = TabularMDP.from_outcomes(self.nS, self.nA, outcomes)
+        self.P = self.mdp.P
 
         # Calculate initial state distribution
         # We always start in state (3, 0)
@@ -192,9 +194,7 @@ class CliffWalkingEnv(Env):
         return outcomes
 
     def step(self, a):
-        transitions = self.P[self.s][a]
-        i = categorical_sample([t[0] for t in transitions], self.np_random)
-        p, s, r, t = transitions[i]
+        p, s, r, t = self.mdp.sample_transition(self.s, a, self.np_random)
         self.s = s
         self.lastaction = a
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from contextlib import closing
+from functools import lru_cache
 from io import StringIO
 from os import path
 
@@ -8,9 +9,11 @@ import numpy as np
 
 import gymnasium as gym
 from gymnasium import Env, spaces, utils
-from gymnasium.envs.toy_text.utils import categorical_sample
+from gymnasium.envs.toy_text.utils import TabularMDP, categorical_sample
 from gymnasium.error import DependencyNotInstalled
 from gymnasium.utils import seeding
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
 
 
 LEFT = 0
@@ -81,6 +84,65 @@ def generate_random_map(
     return ["".join(x) for x in board]
 
 
+@lru_cache(maxsize=32)
+def _frozen_lake_mdp(
+    desc: bytes,
+    nrow: int,
+    ncol: int,
+    is_slippery: bool,
+    success_rate: float,
+    reward_schedule: tuple[int, int, int],
+) -> TabularMDP:
+    """Builds the transition table of a map with array operations, cached so that copies of an env share it."""
+    letters = np.frombuffer(desc, dtype="S1").reshape(nrow, ncol)
+    nS, nA = nrow * ncol, 4
+    row, col = np.divmod(np.arange(nS), ncol)
+    row, col = row[:, None, None], col[:, None, None]
+    actions = np.arange(nA)[None, :, None]
+
+    # the intended move, or the move and the two perpendicular slips
+    if is_slippery:
+        fail_rate = (1.0 - success_rate) / 2.0
+        moves = (actions + np.array([-1, 0, 1])) % 4
+        prob = np.broadcast_to(
+            np.array([fail_rate, success_rate, fail_rate]), (nS, nA, 3)
+        )
+    else:
+        moves = actions
+        prob = np.ones((nS, nA, 1))
+
+    new_row = np.clip(
+        row + np.select([moves == DOWN, moves == UP], [1, -1], 0), 0, nrow - 1
+    )
+    new_col = np.clip(
+        col + np.select([moves == RIGHT, moves == LEFT], [1, -1], 0), 0, ncol - 1
+    )
+    new_state = new_row * ncol + new_col
+    new_letter = letters[new_row, new_col]
+    terminated = (new_letter == b"G") | (new_letter == b"H")
+    reward_schedule = np.asarray(reward_schedule)
+    reward = np.where(
+        new_letter == b"G",
+        reward_schedule[0],
+        np.where(new_letter == b"H", reward_schedule[1], reward_schedule[2]),
+    )
+
+    # goal and holes are absorbing: a single (1.0, s, 0, True) outcome
+    absorbing = ((letters == b"G") | (letters == b"H")).ravel()
+    state = np.arange(nS)[:, None, None]
+    absorbing_3d = absorbing[:, None, None]
+    counts = np.where(absorbing[:, None], 1, moves.shape[2]) * np.ones(
+        (1, nA), dtype=np.int64
+    )
+    return TabularMDP.from_padded(
+        counts,
+        np.where(absorbing_3d, state, new_state),
+        np.where(absorbing_3d, 1.0, prob),
+        np.where(absorbing_3d, 0, reward).astype(reward_schedule.dtype),
+        np.where(absorbing_3d, True, terminated),
+    )
+
+
 class FrozenLakeEnv(Env):
     """
      Frozen lake involves crossing a frozen lake from start to goal without falling into any holes
@@ -253,53 +315,15 @@ class FrozenLakeEnv(Env):
         self.initial_state_distrib = np.array(desc == b"S").astype("float64").ravel()
         self.initial_state_distrib /= self.initial_state_distrib.sum()
 
-        self.P = {s: {a: [] for a in range(nA)} for s in range(nS)}
-
-        fail_rate = (1.0 - success_rate) / 2.0
-
-        def to_s(row, col):
-            return row * ncol + col
-
-        def inc(row, col, a):
-            if a == LEFT:
-                col = max(col - 1, 0)
-            elif a == DOWN:
-                row = min(row + 1, nrow - 1)
-            elif a == RIGHT:
-                col = min(col + 1, ncol - 1)
-            elif a == UP:
-                row = max(row - 1, 0)
-            return (row, col)
-
-        def update_probability_matrix(row, col, action):
-            new_row, new_col = inc(row, col, action)
-            new_state = to_s(new_row, new_col)
-            new_letter = desc[new_row, new_col]
-            terminated = bytes(new_letter) in b"GH"
-            reward = reward_schedule[
-                b"GHF".index(new_letter if new_letter in b"GHF" else b"F")
-            ]
-            return new_state, reward, terminated
-
-        for row in range(nrow):
-            for col in range(ncol):
-                s = to_s(row, col)
-                for a in range(4):
-                    li = self.P[s][a]
-                    letter = desc[row, col]
-                    if letter in b"GH":
-                        li.append((1.0, s, 0, True))
-                    else:
-                        if is_slippery:
-                            for b in [(a - 1) % 4, a, (a + 1) % 4]:
-                                li.append(
-                                    (
-                                        success_rate if b == a else fail_rate,
-                                        *update_probability_matrix(row, col, b),
-                                    )
-                                )
-                        else:
-                            li.append((1.0, *update_probability_matrix(row, col, a)))
+        self.mdp = _frozen_lake_mdp(
+            desc.tobytes(),
+            nrow,
+            ncol,
+            is_slippery,
+            success_rate,
+            tuple(reward_schedule),
+        )
+        self.P = self.mdp.P
 
         self.observation_space = spaces.Discrete(nS)
         self.action_space = spaces.Discrete(nA)
@@ -322,9 +346,7 @@ class FrozenLakeEnv(Env):
         self.start_img = None
 
     def step(self, a):
-        transitions = self.P[self.s][a]
-        i = categorical_sample([t[0] for t in transitions], self.np_random)
-        p, s, r, t = transitions[i]
+        p, s, r, t = self.mdp.sample_transition(self.s, a, self.np_random)
         self.s = s
         self.lastaction = a
 
@@ -493,5 +515,193 @@ class FrozenLakeEnv(Env):
             pygame.quit()
 
 
+class FrozenLakeVectorEnv(VectorEnv):
+    """A vectorized version of :class:`FrozenLakeEnv`, the positions of all copies are kept in one integer array.
+
+    The copies share the transition table of the map (:class:`TabularMDP`). The cumulative probabilities of the
+    outcomes of every state-action pair are precomputed, so a step draws one uniform number per copy and looks up
+    the outcomes of all copies with array operations instead of stepping every copy in Python.
+
+    Example:
+        >>> import gymnasium as gym
+        >>> envs = gym.make_vec("FrozenLake-v1", num_envs=3, vectorization_mode="vector_entry_point")
+        >>> envs
+        FrozenLakeVectorEnv(FrozenLake-v1, num_envs=3)
+        >>> observations, infos = envs.reset(seed=123)
+        >>> observations
+        array([0, 0, 0])
+        >>> observations, rewards, terminations, truncations, infos = envs.step(np.array([1, 2, 1]))
+        >>> observations.shape, rewards.dtype
+        ((3,), dtype('float64'))
+
+    Only the ``"ansi"`` render mode is supported, use ``vectorization_mode="sync"`` for ``"rgb_array"`` frames.
+    As this is the default of ``gym.make_vec`` for FrozenLake, ``make_vec`` with ``wrappers`` or ``vector_kwargs``
+    raises unless ``vectorization_mode="sync"`` (or ``"async"``) is passed, as for the other vector entry points.
+    """
+
+    metadata = {
+        "render_modes": ["ansi"],
+        "render_fps": 4,
+        "autoreset_mode": AutoresetMode.NEXT_STEP,
+    }
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        max_episode_steps: int | None = None,
+        render_mode: str | None = None,
+        desc: list[str] = None,
+        map_name: str = "4x4",
+        is_slippery: bool = True,
+        success_rate: float = 1.0 / 3.0,
+        reward_schedule: tuple[int, int, int] = (1, 0, 0),
+    ):
+        if desc is None and map_name is None:
+            desc = generate_random_map()
+        elif desc is None:
+            desc = MAPS[map_name]
+        self.desc = desc = np.asarray(desc, dtype="c")
+        self.nrow, self.ncol = nrow, ncol = desc.shape
+
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        assert (
+            render_mode is None or render_mode in self.metadata["render_modes"]
+        ), f"FrozenLakeVectorEnv only supports the render modes {self.metadata['render_modes']}, use `vectorization_mode=\"sync\"` for {render_mode!r}"
+        self.render_mode = render_mode
+
+        self.initial_state_distrib = np.array(desc == b"S").astype("float64").ravel()
+        self.initial_state_distrib /= self.initial_state_distrib.sum()
+
+        self.mdp = mdp = _frozen_lake_mdp(
+            desc.tobytes(),
+            nrow,
+            ncol,
+            is_slippery,
+            success_rate,
+            tuple(reward_schedule),
+        )
+
+        # the cumulative probabilities of the table, padded with inf to the largest number of outcomes of a
+        # state-action pair so that the padding is never chosen
+        counts = np.diff(mdp.indptr)
+        slots = np.arange(counts.max())
+        index = mdp.indptr[:-1, None] + slots
+        used = slots < counts[:, None]
+        self._cum_prob = np.where(used, mdp.cum_prob[np.where(used, index, 0)], np.inf)
+        self._last_outcome = counts - 1
+
+        self.state = None
+        self.lastaction = None
+
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.prev_done = np.zeros(num_envs, dtype=np.bool_)
+
+        self.single_observation_space = spaces.Discrete(nrow * ncol)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.single_action_space = spaces.Discrete(4)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+    def step(
+        self, action: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        assert self.action_space.contains(
+            action
+        ), f"{action!r} ({type(action)}) invalid"
+        assert self.state is not None, "Call reset before using step method."
+
+        # sample an outcome of every copy with one uniform draw, the first outcome whose cumulative probability is
+        # larger than the draw (the same rule as `categorical_sample`)
+        pair = self.state * 4 + action
+        uniform = self.np_random.random(self.num_envs)
+        outcome = np.minimum(
+            (self._cum_prob[pair] <= uniform[:, None]).sum(axis=1),
+            self._last_outcome[pair],
+        )
+        outcome += self.mdp.indptr[pair]
+
+        self.state = self.mdp.next_state[outcome]
+        self.lastaction = np.asarray(action)
+        reward = self.mdp.reward[outcome].astype(np.float64)
+        terminated = self.mdp.terminated[outcome].copy()
+        prob = self.mdp.prob[outcome]
+
+        self.steps += 1
+        if self.max_episode_steps is None:
+            truncated = np.zeros(self.num_envs, dtype=np.bool_)
+        else:
+            truncated = self.steps >= self.max_episode_steps
+
+        # Reset all environments which terminated or were truncated in the last step
+        self.state[self.prev_done] = self._initial_states(self.prev_done.sum())
+        self.steps[self.prev_done] = 0
+        reward[self.prev_done] = 0.0
+        terminated[self.prev_done] = False
+        truncated[self.prev_done] = False
+        prob = np.where(self.prev_done, 1.0, prob)
+
+        self.prev_done = np.logical_or(terminated, truncated)
+
+        return (
+            self.state.copy(),
+            reward,
+            terminated,
+            truncated,
+            {"prob": prob, "_prob": np.ones(self.num_envs, dtype=np.bool_)},
+        )
+
+    def reset(
+        self,
+        *,
+        seed: int | None = None,
+        options: dict | None = None,
+    ):
+        super().reset(seed=seed)
+        self.state = self._initial_states(self.num_envs)
+        self.lastaction = None
+        self.steps = np.zeros(self.num_envs, dtype=np.int32)
+        self.prev_done = np.zeros(self.num_envs, dtype=np.bool_)
+
+        return self.state.copy(), {
+            "prob": np.ones(self.num_envs),
+            "_prob": np.ones(self.num_envs, dtype=np.bool_),
+        }
+
+    def _initial_states(self, n: int) -> np.ndarray:
+        """Draws ``n`` start states from the initial state distribution."""
+        return np.searchsorted(
+            np.cumsum(self.initial_state_distrib),
+            self.np_random.random(n),
+            side="right",
+        ).astype(np.int64)
+
+    def render(self):
+        if self.render_mode is None:
+            assert self.spec is not None
+            gym.logger.warn(
+                "You are calling render method without specifying any render mode. "
+                "You can specify the render_mode at initialization, "
+                f'e.g. gym.make_vec("{self.spec.id}", render_mode="ansi")'
+            )
+            return
+
+        if self.state is None:
+            raise ValueError(
+                "FrozenLake's state is None, it probably hasn't be reset yet."
+            )
+
+        texts = []
+        for i, s in enumerate(self.state):
+            desc = [[c.decode("utf-8") for c in line] for line in self.desc.tolist()]
+            row, col = s // self.ncol, s % self.ncol
+            desc[row][col] = utils.colorize(desc[row][col], "red", highlight=True)
+            if self.lastaction is not None:
+                text = f"  ({['Left', 'Down', 'Right', 'Up'][self.lastaction[i]]})\n"
+            else:
+                text = "\n"
+            texts.append(text + "\n".join("".join(line) for line in desc) + "\n")
+        return texts
+
+
 # Elf and stool from https://franuka.itch.io/rpg-snow-tileset
 # All other assets by Mel Tillery http://www.cyaneus.com/
@@ -6,7 +6,7 @@ import numpy as np
 
 import gymnasium as gym
 from gymnasium import Env, spaces, utils
-from gymnasium.envs.toy_text.utils import categorical_sample
+from gymnasium.envs.toy_text.utils import TabularMDP, categorical_sample
 from gymnasium.error import DependencyNotInstalled
 
 
@@ -192,7 +192,7 @@ class TaxiEnv(Env):
         return new_pass_idx, new_reward, new_terminated
 
     def _build_dry_transitions(self, row, col, pass_idx, dest_idx, action):
-        """Computes the next action for a state (row, col, pass_idx, dest_idx) and action."""
+        """Computes the outcomes ``(state, action, prob, next_state, reward, terminated)`` of a state (row, col, pass_idx, dest_idx) and action."""
         state = self.encode(row, col, pass_idx, dest_idx)
 
         taxi_loc = (row, col)
@@ -216,7 +216,7 @@ class TaxiEnv(Env):
             )
 
         new_state = self.encode(new_row, new_col, new_pass_idx, dest_idx)
-        self.P[state][action].append((1.0, new_state, reward, terminated))
+        return [(state, action, 1.0, new_state, reward, terminated)]
 
     def _calc_new_position(self, row, col, movement, offset=0):
         """Calculates the new position for a row and col to the movement."""
@@ -229,7 +229,7 @@ class TaxiEnv(Env):
             return row, col
 
     def _build_rainy_transitions(self, row, col, pass_idx, dest_idx, action):
-        """Computes the next action for a state (row, col, pass_idx, dest_idx) and action for `is_rainy`."""
+        """Computes the outcomes ``(state, action, prob, next_state, reward, terminated)`` of a state (row, col, pass_idx, dest_idx) and action for `is_rainy`."""
         state = self.encode(row, col, pass_idx, dest_idx)
 
         taxi_loc = left_pos = right_pos = (row, col)
@@ -270,11 +270,12 @@ class TaxiEnv(Env):
                 right_pos[0], right_pos[1], new_pass_idx, dest_idx
             )
 
-            self.P[state][action].append((0.8, intended_state, -1, terminated))
-            self.P[state][action].append((0.1, left_state, -1, terminated))
-            self.P[state][action].append((0.1, right_state, -1, terminated))
-        else:
-            self.P[state][action].append((1.0, intended_state, reward, terminated))
+            return [
+                (state, action, 0.8, intended_state, -1, terminated),
+                (state, action, 0.1, left_state, -1, terminated),
+                (state, action, 0.1, right_state, -1, terminated),
+            ]
+        return [(state, action, 1.0, intended_state, reward, terminated)]
 
     def __init__(
         self,
@@ -294,10 +295,8 @@ class TaxiEnv(Env):
         self.max_col = num_columns - 1
         self.initial_state_distrib = np.zeros(num_states)
         num_actions = 6
-        self.P = {
-            state: {action: [] for action in range(num_actions)}
-            for state in range(num_states)
-        }
+        # (state, action, prob, next_state, reward, terminated) of every outcome, compiled into `self.mdp` below
+        outcomes = []
 
         for row in range(num_rows):
             for col in range(num_columns):
@@ -308,7 +307,7 @@ class TaxiEnv(Env):
                             self.initial_state_distrib[state] += 1
                         for action in range(num_actions):
                             if is_rainy:
-                                self._build_rainy_transitions(
+                                outcomes += self._build_rainy_transitions(
                                     row,
                                     col,
                                     pass_idx,
@@ -316,7 +315,7 @@ class TaxiEnv(Env):
                                     action,
                                 )
                             else:
-                                self._build_dry_transitions(
+                                outcomes += self._build_dry_transitions(
                                     row,
                                     col,
                                     pass_idx,
@@ -324,6 +323,8 @@ class TaxiEnv(Env):
                                     action,
                                 )
         self.initial_state_distrib /= self.initial_state_distrib.sum()
+        self.mdp = TabularMDP.from_outcomes(num_states, num_actions, outcomes)
+        self.P = self.mdp.P
         self.action_space = spaces.Discrete(num_actions)
         self.observation_space = spaces.Discrete(num_states)
 
@@ -391,9 +392,7 @@ class TaxiEnv(Env):
         return mask
 
     def step(self, a):
-        transitions = self.P[self.s][a]
-        i = categorical_sample([t[0] for t in transitions], self.np_random)
-        p, s, r, t = transitions[i]
+        p, s, r, t = self.mdp.sample_transition(self.s, a, self.np_random)
         self.lastaction = a
 
         shadow_row, shadow_col, shadow_pass_loc, shadow_dest_idx = self.decode(self.s)
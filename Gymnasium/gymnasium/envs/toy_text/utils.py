@@ -1,3 +1,9 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping
+from typing import Any
+
 import numpy as np
 
 
@@ -6,3 +12,268 @@ def categorical_sample(prob_n, np_random: np.random.Generator):
     prob_n = np.asarray(prob_n)
     csprob_n = np.cumsum(prob_n)
     return np.argmax(csprob_n > np_random.random())
+
+
+class TabularMDP:
+    """The transitions of a tabular MDP stored as flat CSR-style arrays.
+
+    The outcomes of the state-action pair ``(s, a)`` are the entries ``indptr[s * n_actions + a]`` up to
+    ``indptr[s * n_actions + a + 1]`` of :attr:`next_state`, :attr:`prob`, :attr:`reward` and :attr:`terminated`,
+    in the same order as in the classic ``P[s][a]`` list of ``(prob, next_state, reward, terminated)`` tuples.
+
+    The arrays are read-only, so one table can be shared by all copies of an environment, and planners can use them
+    without copying. :attr:`P` is a lazy view with the old dict-of-dicts-of-lists interface, the lists are only
+    built (and then kept) for the state-action pairs that are looked up. ``P[s][a]`` is a tuple rather than a list and
+    the view does not support assignment, because the table is shared.
+
+    :attr:`cum_prob` holds the cumulative probabilities of the outcomes of every pair, so that :meth:`sample` draws an
+    outcome with one uniform number and a binary search instead of summing the probabilities on every step.
+    """
+
+    def __init__(
+        self,
+        n_states: int,
+        n_actions: int,
+        indptr: np.ndarray,
+        next_state: np.ndarray,
+        prob: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+    ):
+        """Initialises the table from CSR arrays, see the class docstring for the layout.
+
+        Args:
+            n_states: The number of states
+            n_actions: The number of actions
+            indptr: The offsets of the outcomes of every state-action pair, shape ``(n_states * n_actions + 1,)``
+            next_state: The next state of every outcome
+            prob: The probability of every outcome
+            reward: The reward of every outcome, the dtype is kept (e.g. integer rewards stay integers in :attr:`P`)
+            terminated: If every outcome terminates the episode
+        """
+        self.n_states = int(n_states)
+        self.n_actions = int(n_actions)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.next_state = np.asarray(next_state, dtype=np.int64)
+        self.prob = np.asarray(prob, dtype=np.float64)
+        self.reward = np.asarray(reward)
+        self.terminated = np.asarray(terminated, dtype=np.bool_)
+
+        if self.indptr.shape != (self.n_states * self.n_actions + 1,):
+            raise ValueError(
+                f"Expected `indptr` of shape {(self.n_states * self.n_actions + 1,)}, actual shape: {self.indptr.shape}"
+            )
+        num_outcomes = int(self.indptr[-1])
+        for name in ("next_state", "prob", "reward", "terminated"):
+            if getattr(self, name).shape != (num_outcomes,):
+                raise ValueError(
+                    f"Expected `{name}` of shape {(num_outcomes,)}, actual shape: {getattr(self, name).shape}"
+                )
+
+        # the cumulative sums restart at every pair, computed row by row like `np.cumsum` of the pair's probabilities
+        counts = np.diff(self.indptr)
+        slots = np.arange(counts.max(initial=0))
+        used = slots < counts[:, None]
+        padded = np.zeros(used.shape)
+        padded[used] = self.prob
+        self.cum_prob = np.cumsum(padded, axis=1)[used]
+
+        self._P = None
+        for array in (
+            self.indptr,
+            self.next_state,
+            self.prob,
+            self.reward,
+            self.terminated,
+            self.cum_prob,
+        ):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_padded(
+        cls,
+        counts: np.ndarray,
+        next_state: np.ndarray,
+        prob: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+    ) -> TabularMDP:
+        """Builds the table from arrays of shape ``(n_states, n_actions, K)`` where only the first ``counts[s, a]`` outcomes of every pair are used."""
+        counts = np.asarray(counts, dtype=np.int64)
+        n_states, n_actions = counts.shape
+        used = np.arange(np.shape(next_state)[2]) < counts[:, :, None]
+        indptr = np.zeros(n_states * n_actions + 1, dtype=np.int64)
+        np.cumsum(counts.ravel(), out=indptr[1:])
+        return cls(
+            n_states,
+            n_actions,
+            indptr,
+            np.asarray(next_state)[used],
+            np.asarray(prob)[used],
+            np.asarray(reward)[used],
+            np.asarray(terminated)[used],
+        )
+
+    @classmethod
+    def from_outcomes(
+        cls,
+        n_states: int,
+        n_actions: int,
+        outcomes: list[tuple[int, int, float, int, Any, bool]],
+    ) -> TabularMDP:
+        """Builds the table from ``(state, action, prob, next_state, reward, terminated)`` tuples.
+
+        The tuples can be in any order, the outcomes of one state-action pair keep their relative order.
+        """
+        state, action, prob, next_state, reward, terminated = (
+            np.asarray(column) for column in zip(*outcomes)
+        )
+        pair = state * n_actions + action
+        order = np.argsort(pair, kind="stable")
+        indptr = np.zeros(n_states * n_actions + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair, minlength=n_states * n_actions), out=indptr[1:])
+        return cls(
+            n_states,
+            n_actions,
+            indptr,
+            next_state[order],
+            prob[order],
+            reward[order],
+            terminated[order],
+        )
+
+    @classmethod
+    def from_dict(
+        cls, P: Mapping[int, Mapping[int, list[tuple[float, int, Any, bool]]]]
+    ) -> TabularMDP:
+        """Builds the table from a classic ``P[s][a]`` dict of lists of ``(prob, next_state, reward, terminated)``."""
+        n_states = len(P)
+        n_actions = len(P[0])
+        return cls.from_outcomes(
+            n_states,
+            n_actions,
+            [
+                (s, a, *transition)
+                for s in range(n_states)
+                for a in range(n_actions)
+                for transition in P[s][a]
+            ],
+        )
+
+    def outcomes(self, state: int, action: int) -> slice:
+        """The slice of the outcome arrays that belongs to ``(state, action)``."""
+        pair = state * self.n_actions + action
+        return slice(int(self.indptr[pair]), int(self.indptr[pair + 1]))
+
+    def _sample_index(
+        self, state: int, action: int, np_random: np.random.Generator
+    ) -> tuple[int, int]:
+        """Samples an outcome of ``(state, action)``, returns its index in the outcome arrays and the pair's start."""
+        pair = state * self.n_actions + action
+        start, stop = self.indptr[pair : pair + 2].tolist()
+        assert start < stop, f"({state}, {action}) has no outcomes"
+        # only the pair's few cumulative probabilities become a list, a binary search on it is cheaper than a NumPy
+        # call, min: in case rounding leaves the last cumulative probability just below the draw
+        position = bisect_right(self.cum_prob[start:stop].tolist(), np_random.random())
+        return start + min(position, stop - start - 1), start
+
+    def sample(self, state: int, action: int, np_random: np.random.Generator) -> int:
+        """Samples an outcome of ``(state, action)``, returns its position in ``P[state][action]``.
+
+        The outcome is the first one whose cumulative probability is larger than one uniform draw, the same outcome
+        :func:`categorical_sample` picks for the same draw.
+        """
+        index, start = self._sample_index(state, action, np_random)
+        return index - start
+
+    def sample_transition(
+        self, state: int, action: int, np_random: np.random.Generator
+    ) -> tuple[float, int, Any, bool]:
+        """Samples an outcome of ``(state, action)`` like :meth:`sample`, returns it as a ``(prob, next_state, reward, terminated)`` tuple of Python scalars."""
+        index, _ = self._sample_index(state, action, np_random)
+        return (
+            self.prob[index].item(),
+            self.next_state[index].item(),
+            self.reward[index].item(),
+            self.terminated[index].item(),
+        )
+
+    def transitions(
+        self, state: int, action: int
+    ) -> list[tuple[float, int, Any, bool]]:
+        """The outcomes of ``(state, action)``, the same list as ``P[state][action]``."""
+        outcomes = self.outcomes(state, action)
+        return list(
+            zip(
+                self.prob[outcomes].tolist(),
+                self.next_state[outcomes].tolist(),
+                self.reward[outcomes].tolist(),
+                self.terminated[outcomes].tolist(),
+            )
+        )
+
+    @property
+    def P(self) -> TransitionsView:
+        """A lazy, read-only ``P[s][a]`` view of the table."""
+        if self._P is None:
+            self._P = TransitionsView(self)
+        return self._P
+
+
+class TransitionsView(Mapping):
+    """Read-only ``P[s][a] -> [(prob, next_state, reward, terminated), ...]`` view of a :class:`TabularMDP`."""
+
+    def __init__(self, mdp: TabularMDP):
+        """Initialises the view of ``mdp``."""
+        self.mdp = mdp
+        self._states = {}
+
+    def __getitem__(self, state: int) -> StateTransitionsView:
+        """The actions of ``state``."""
+        view = self._states.get(state)
+        if view is None:
+            if not 0 <= state < self.mdp.n_states:
+                raise KeyError(state)
+            view = self._states[state] = StateTransitionsView(self.mdp, int(state))
+        return view
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the states."""
+        return iter(range(self.mdp.n_states))
+
+    def __len__(self) -> int:
+        """The number of states."""
+        return self.mdp.n_states
+
+
+class StateTransitionsView(Mapping):
+    """Read-only ``P[s]`` view, maps every action to a tuple of its outcomes.
+
+    The tuples are cached in the view and shared by every environment that uses the same table, so they are
+    immutable.
+    """
+
+    def __init__(self, mdp: TabularMDP, state: int):
+        """Initialises the view of the actions of ``state``."""
+        self.mdp = mdp
+        self.state = state
+        self._actions = {}
+
+    def __getitem__(self, action: int) -> tuple[tuple[float, int, Any, bool], ...]:
+        """The outcomes of ``action``."""
+        transitions = self._actions.get(action)
+        if transitions is None:
+            if not 0 <= action < self.mdp.n_actions:
+                raise KeyError(action)
+            transitions = self._actions[action] = tuple(
+                self.mdp.transitions(self.state, int(action))
+            )
+        return transitions
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the actions."""
+        return iter(range(self.mdp.n_actions))
+
+    def __len__(self) -> int:
+        """The number of actions."""
+        return self.mdp.n_actions
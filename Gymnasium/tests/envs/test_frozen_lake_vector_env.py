@@ -0,0 +1,138 @@
+"""Tests for the array-based FrozenLake vector environment."""
+
+import numpy as np
+import pytest
+
+import gymnasium as gym
+from gymnasium.envs.toy_text.frozen_lake import FrozenLakeVectorEnv
+from gymnasium.vector import SyncVectorEnv
+
+
+def test_make_vec_frozen_lake():
+    """`make_vec` uses the vector entry point and passes the time limit of the spec."""
+    envs = gym.make_vec("FrozenLake-v1", num_envs=4)
+    assert isinstance(envs, FrozenLakeVectorEnv)
+    assert envs.max_episode_steps == 100
+    assert envs.nrow == envs.ncol == 4
+    envs.close()
+
+    envs = gym.make_vec("FrozenLake8x8-v1", num_envs=4)
+    assert isinstance(envs, FrozenLakeVectorEnv)
+    assert envs.max_episode_steps == 200
+    assert envs.nrow == envs.ncol == 8
+    envs.close()
+
+    envs = gym.make_vec("FrozenLake-v1", num_envs=4, vectorization_mode="sync")
+    assert isinstance(envs, SyncVectorEnv)
+    envs.close()
+
+
+@pytest.mark.parametrize("success_rate", [1.0 / 3.0, 0.8])
+def test_frozen_lake_vector_transition_frequencies(success_rate):
+    """Every copy samples its next state with the probabilities of the transition table."""
+    num_envs = 20_000
+    envs = FrozenLakeVectorEnv(
+        num_envs=num_envs, map_name="8x8", success_rate=success_rate
+    )
+    envs.reset(seed=0)
+    state, action = 9, 2
+    envs.state[:] = state
+    observations, _, _, _, infos = envs.step(np.full(num_envs, action))
+
+    for prob, next_state, _, _ in envs.mdp.P[state][action]:
+        frequency = np.mean(observations == next_state)
+        assert abs(frequency - prob) < 0.02
+    assert np.all(np.isin(infos["prob"], [success_rate, (1 - success_rate) / 2]))
+
+
+def test_frozen_lake_vector_matches_single_env():
+    """Without slipping, the copies follow the same trajectories as single environments."""
+    num_envs = 8
+    vector_envs = gym.make_vec("FrozenLake8x8-v1", num_envs=num_envs, is_slippery=False)
+    sync_envs = gym.make_vec(
+        "FrozenLake8x8-v1",
+        num_envs=num_envs,
+        is_slippery=False,
+        vectorization_mode="sync",
+    )
+    vector_obs, _ = vector_envs.reset(seed=1)
+    sync_obs, _ = sync_envs.reset(seed=1)
+    np.testing.assert_array_equal(vector_obs, sync_obs)
+
+    rng = np.random.default_rng(1)
+    for _ in range(500):
+        actions = rng.integers(4, size=num_envs)
+        vector_step = vector_envs.step(actions)
+        sync_step = sync_envs.step(actions)
+        for vector_value, sync_value in zip(vector_step[:4], sync_step[:4]):
+            np.testing.assert_array_equal(vector_value, sync_value)
+        np.testing.assert_array_equal(vector_step[4]["prob"], sync_step[4]["prob"])
+
+    vector_envs.close()
+    sync_envs.close()
+
+
+def test_frozen_lake_vector_autoreset_and_truncation():
+    """A finished copy is reset on the next step (next-step autoreset) and episodes are truncated."""
+    envs = FrozenLakeVectorEnv(num_envs=2, max_episode_steps=3, is_slippery=False)
+    envs.reset(seed=0)
+
+    # copy 0 walks down twice and right, copy 1 keeps walking into the left wall
+    _, _, terminated, truncated, _ = envs.step(np.array([1, 0]))
+    _, _, terminated, truncated, _ = envs.step(np.array([1, 0]))
+    np.testing.assert_array_equal(terminated, [False, False])
+
+    observations, rewards, terminated, truncated, _ = envs.step(np.array([2, 0]))
+    np.testing.assert_array_equal(observations, [9, 0])
+    np.testing.assert_array_equal(terminated, [False, False])
+    np.testing.assert_array_equal(truncated, [True, True])
+
+    observations, rewards, terminated, truncated, infos = envs.step(np.array([2, 2]))
+    np.testing.assert_array_equal(observations, [0, 0])
+    np.testing.assert_array_equal(rewards, [0.0, 0.0])
+    np.testing.assert_array_equal(terminated | truncated, [False, False])
+    np.testing.assert_array_equal(infos["prob"], [1.0, 1.0])
+
+    # copy 0 walks into the hole below the second tile
+    envs.step(np.array([2, 2]))
+    observations, _, terminated, _, _ = envs.step(np.array([1, 2]))
+    np.testing.assert_array_equal(observations, [5, 2])
+    np.testing.assert_array_equal(terminated, [True, False])
+
+
+def test_frozen_lake_vector_seeding():
+    """The same seed gives the same trajectories."""
+    first = FrozenLakeVectorEnv(num_envs=16, map_name="8x8")
+    second = FrozenLakeVectorEnv(num_envs=16, map_name="8x8")
+    np.testing.assert_array_equal(first.reset(seed=42)[0], second.reset(seed=42)[0])
+
+    rng = np.random.default_rng(42)
+    for _ in range(100):
+        actions = rng.integers(4, size=16)
+        for first_value, second_value in zip(
+            first.step(actions)[:4], second.step(actions)[:4]
+        ):
+            np.testing.assert_array_equal(first_value, second_value)
+
+
+def test_frozen_lake_vector_render():
+    """The ansi render mode returns the text of every copy, the other modes are rejected."""
+    envs = FrozenLakeVectorEnv(num_envs=2, render_mode="ansi")
+    envs.reset(seed=0)
+    texts = envs.render()
+    assert len(texts) == 2
+    envs.step(np.array([1, 2]))
+    texts = envs.render()
+    assert texts[0].startswith("  (Down)") and texts[1].startswith("  (Right)")
+
+    with pytest.raises(AssertionError, match="render modes"):
+        gym.make_vec("FrozenLake-v1", num_envs=2, render_mode="rgb_array")
+    envs = gym.make_vec(
+        "FrozenLake-v1",
+        num_envs=2,
+        render_mode="rgb_array",
+        vectorization_mode="sync",
+    )
+    envs.reset(seed=0)
+    assert all(frame.ndim == 3 for frame in envs.render())
+    envs.close()
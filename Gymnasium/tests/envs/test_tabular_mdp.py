@@ -0,0 +1,141 @@
+"""Tests for the CSR transition tables of the toy text environments."""
+
+import numpy as np
+import pytest
+
+from gymnasium.envs.toy_text import CliffWalkingEnv, FrozenLakeEnv, TaxiEnv
+from gymnasium.envs.toy_text.frozen_lake import generate_random_map
+from gymnasium.envs.toy_text.utils import TabularMDP, categorical_sample
+
+
+TABULAR_ENVS = [
+    lambda: FrozenLakeEnv(),
+    lambda: FrozenLakeEnv(map_name="8x8", is_slippery=False),
+    lambda: FrozenLakeEnv(desc=generate_random_map(size=12, seed=3), success_rate=0.5),
+    lambda: TaxiEnv(),
+    lambda: TaxiEnv(is_rainy=True),
+    lambda: CliffWalkingEnv(),
+    lambda: CliffWalkingEnv(is_slippery=True),
+]
+
+
+@pytest.mark.parametrize("env_fn", TABULAR_ENVS)
+def test_tabular_mdp_matches_P(env_fn):
+    """The lazy `P` view and the CSR arrays describe the same transitions."""
+    env = env_fn()
+    mdp = env.mdp
+    assert isinstance(mdp, TabularMDP)
+    assert mdp.n_states == env.observation_space.n
+    assert mdp.n_actions == env.action_space.n
+    assert len(env.P) == mdp.n_states
+    assert np.all(np.diff(mdp.indptr) > 0)
+
+    for state, actions in env.P.items():
+        assert len(actions) == mdp.n_actions
+        for action, transitions in actions.items():
+            outcomes = mdp.outcomes(state, action)
+            assert len(transitions) == outcomes.stop - outcomes.start
+            for index, (prob, next_state, reward, terminated) in zip(
+                range(outcomes.start, outcomes.stop), transitions
+            ):
+                assert prob == mdp.prob[index]
+                assert next_state == mdp.next_state[index]
+                assert reward == mdp.reward[index]
+                assert terminated == mdp.terminated[index]
+            assert np.isclose(sum(t[0] for t in transitions), 1.0)
+
+
+@pytest.mark.parametrize("env_fn", TABULAR_ENVS)
+def test_tabular_mdp_from_dict_round_trip(env_fn):
+    """Building a table from the classic dict gives the same arrays."""
+    mdp = env_fn().mdp
+    rebuilt = TabularMDP.from_dict(mdp.P)
+    for name in ("indptr", "next_state", "prob", "reward", "terminated"):
+        np.testing.assert_array_equal(getattr(rebuilt, name), getattr(mdp, name))
+
+
+def test_tabular_mdp_read_only():
+    """The arrays can be shared between copies, so they can not be written."""
+    env = FrozenLakeEnv(map_name="8x8")
+    with pytest.raises(ValueError):
+        env.mdp.prob[0] = 0.5
+    with pytest.raises(TypeError):
+        env.P[0][0] = []
+    with pytest.raises(TypeError):
+        env.P[0][0][0] = (1.0, 0, 0, False)
+    with pytest.raises(KeyError):
+        env.P[env.observation_space.n]
+
+    # copies of the same map share one table, and with it the cached outcomes of `P`
+    other = FrozenLakeEnv(map_name="8x8")
+    assert other.mdp is env.mdp
+    assert isinstance(other.P[0][0], tuple)
+
+
+def test_tabular_mdp_from_outcomes_order():
+    """Outcomes are grouped by state-action pair and keep their relative order."""
+    mdp = TabularMDP.from_outcomes(
+        2,
+        2,
+        [
+            (1, 1, 0.25, 0, -1, False),
+            (0, 0, 1.0, 1, 0, False),
+            (1, 1, 0.75, 1, 2, True),
+            (0, 1, 1.0, 0, 0, False),
+            (1, 0, 1.0, 1, 1, True),
+        ],
+    )
+    np.testing.assert_array_equal(mdp.indptr, [0, 1, 2, 3, 5])
+    assert mdp.transitions(1, 1) == [(0.25, 0, -1, False), (0.75, 1, 2, True)]
+    assert isinstance(mdp.transitions(1, 1)[0][2], int)
+
+    with pytest.raises(ValueError):
+        TabularMDP(2, 2, [0, 1, 2], [0], [1.0], [0], [False])
+
+
+@pytest.mark.parametrize("env_fn", TABULAR_ENVS)
+def test_tabular_mdp_sample_matches_categorical_sample(env_fn):
+    """Sampling with the cumulative table picks the same outcomes as `categorical_sample`, seeded runs do not change."""
+    mdp = env_fn().mdp
+    np.testing.assert_allclose(mdp.cum_prob[mdp.indptr[1:] - 1], 1.0)
+
+    rng, reference_rng = np.random.default_rng(7), np.random.default_rng(7)
+    for state in range(0, mdp.n_states, max(1, mdp.n_states // 50)):
+        for action in range(mdp.n_actions):
+            probs = [t[0] for t in mdp.P[state][action]]
+            for _ in range(20):
+                assert mdp.sample(state, action, rng) == categorical_sample(
+                    probs, reference_rng
+                )
+
+
+@pytest.mark.parametrize("env_fn", TABULAR_ENVS)
+def test_tabular_mdp_step_uses_arrays(env_fn):
+    """`step` samples its transition from the arrays, the `P` view is not built on the way."""
+    env = env_fn()
+    env.reset(seed=0)
+    mdp = env.mdp
+    rng, reference_rng = np.random.default_rng(3), np.random.default_rng(3)
+    for state in range(0, mdp.n_states, max(1, mdp.n_states // 20)):
+        for action in range(mdp.n_actions):
+            position = mdp.sample(state, action, reference_rng)
+            assert (
+                mdp.sample_transition(state, action, rng)
+                == mdp.transitions(state, action)[position]
+            )
+
+    fresh = TabularMDP.from_dict(mdp.P)
+    env.mdp = fresh
+    for _ in range(50):
+        _, _, terminated, _, _ = env.step(env.action_space.sample())
+        if terminated:
+            env.reset()
+    assert fresh._P is None
+
+
+def test_tabular_mdp_sample_without_outcomes():
+    """A state-action pair without outcomes can not be sampled, instead of silently using another pair's outcome."""
+    mdp = TabularMDP(1, 2, [0, 1, 1], [0], [1.0], [0], [True])
+    assert mdp.sample_transition(0, 0, np.random.default_rng(0)) == (1.0, 0, 0, True)
+    with pytest.raises(AssertionError, match="no outcomes"):
+        mdp.sample_transition(0, 1, np.random.default_rng(0))
@@ -5,6 +5,7 @@ import gymnasium as gym
 import numpy as np
 import matplotlib.pyplot as plt
 import pickle
+from rolling_stats import RollingStats
 
 def run(episodes, is_training=True, render=False):
     if is_training:
@@ -32,7 +33,8 @@ def run(episodes, is_training=True, render=False):
     epsilon_decay_rate = 2/episodes # epsilon decay rate
     rng = np.random.default_rng()   # random number generator
 
-    rewards_per_episode = np.zeros(episodes)
+    stats = RollingStats(window=100)    # mean reward of the last 100 episodes, updated every episode
+    report_every = max(1, episodes // 10)
 
     for i in range(episodes):
         state = env.reset()[0]      # Starting position, starting velocity always 0
@@ -68,7 +70,9 @@ def run(episodes, is_training=True, render=False):
 
         epsilon = max(epsilon - epsilon_decay_rate, 0)
 
-        rewards_per_episode[i] = rewards
+        stats.add(rewards)
+        if (i + 1) % report_every == 0:
+            print(f"Episode {i + 1}: mean reward of the last {stats.window} episodes {stats.mean:.1f}")
 
     env.close()
 
@@ -78,10 +82,7 @@ def run(episodes, is_training=True, render=False):
         pickle.dump(q, f)
         f.close()
 
-    mean_rewards = np.zeros(episodes)
-    for t in range(episodes):
-        mean_rewards[t] = np.mean(rewards_per_episode[max(0, t-100):(t+1)])
-    plt.plot(mean_rewards)
+    plt.plot(stats.means())
     plt.savefig(f'mountain_car.png')
 
 if __name__ == '__main__':
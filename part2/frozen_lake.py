@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pickle
 from gymnasium.envs.toy_text.frozen_lake import generate_random_map
+import mdp_solvers
+from rolling_stats import rolling_sum
 
 # 設定種子碼 (Seed) 以生成固定的地圖
 seed_value = 42
@@ -17,6 +19,19 @@ def print_success_rate(rewards_per_episode):
     print(f"✅ Success Rate: {success_rate:.2f}% ({int(success_count)} / {total_episodes} episodes)")
     return success_rate
 
+def exact_success_rate(env, policy):
+    """
+    success rate of a policy computed from the transitions instead of simulated episodes (mdp_solvers.expected_return):
+    the probability of reaching the goal within the env's step limit, and without a limit.
+    """
+    mdp = mdp_solvers.ArrayMDP.from_env(env)
+    start = env.unwrapped.initial_state_distrib
+    horizon = env.spec.max_episode_steps if env.spec is not None else None
+    limited = start @ mdp_solvers.expected_return(mdp, policy, horizon) * 100
+    unlimited = start @ mdp_solvers.expected_return(mdp, policy) * 100
+    print(f"🎯 Exact Success Rate: {limited:.2f}% (within {horizon} steps), {unlimited:.2f}% (no step limit)")
+    return limited
+
 def run(episodes, is_training=True, render=False):
 
     env = gym.make('FrozenLake-v1', map_name="8x8", is_slippery=True, render_mode='human' if render else None)
@@ -66,10 +81,7 @@ def run(episodes, is_training=True, render=False):
 
     env.close()
 
-    sum_rewards = np.zeros(episodes)
-    for t in range(episodes):
-        sum_rewards[t] = np.sum(rewards_per_episode[max(0, t-100):(t+1)])
-    plt.plot(sum_rewards)
+    plt.plot(rolling_sum(rewards_per_episode, 100))
     plt.savefig('frozen_lake8x8.png')
     
     if is_training == False:
@@ -118,7 +130,23 @@ def value_iteration(env, gamma=0.99, theta=1e-8):
 
     return policy
 
-def run_value_iteration(episodes=5000, render=False, load=False):
+def value_iteration_vectorized(env, gamma=0.99, theta=1e-8):
+    """
+    Value Iteration on transition arrays compiled once from P (mdp_solvers.py), every sweep is one batched backup.
+    returns optimal policy, like value_iteration.
+    """
+    policy, _, _ = mdp_solvers.value_iteration(mdp_solvers.ArrayMDP.from_env(env), gamma, theta)
+    return policy
+
+def solve_policy(env, solver="value_iteration", gamma=0.99):
+    """
+    optimal policy from one of mdp_solvers.SOLVERS:
+    "value_iteration", "policy_iteration" (exact evaluation by a sparse linear solve) or "modified_policy_iteration"
+    """
+    policy, _, _ = mdp_solvers.SOLVERS[solver](mdp_solvers.ArrayMDP.from_env(env), gamma=gamma)
+    return policy
+
+def run_value_iteration(episodes=5000, render=False, load=False, solver="value_iteration"):
     env = gym.make('FrozenLake-v1', desc=random_map, is_slippery=True, render_mode='human' if render else None)
 
     # ---------------- load or compute policy ----------------
@@ -126,11 +154,17 @@ def run_value_iteration(episodes=5000, render=False, load=False):
         with open("frozen_lake_vi_policy.pkl", "rb") as f:
             policy = pickle.load(f)
     else:
-        policy = value_iteration(env)
+        policy = solve_policy(env, solver)
         with open("frozen_lake_vi_policy.pkl", "wb") as f:
             pickle.dump(policy, f)
 
     # ---------------- evaluation ----------------
+    # exact: milliseconds and no variance, the sampled episodes below should agree with it
+    exact_success_rate(env, policy)
+    if episodes == 0:
+        env.close()
+        return
+
     rewards_per_episode = np.zeros(episodes)
 
     for ep in range(episodes):
@@ -149,12 +183,9 @@ def run_value_iteration(episodes=5000, render=False, load=False):
 
     # 繪圖: 計算滾動總和 (Rolling Sum) 或 平均值
     # 你原本的程式碼是計算過去 100 回合的總和
-    sum_rewards = np.zeros(episodes)
     window_size = 100
-    
-    for t in range(episodes):
-        # 取 max(0, t-100) 到 t+1 的區間總和
-        sum_rewards[t] = np.sum(rewards_per_episode[max(0, t - window_size):(t + 1)])
+    # 最近 window_size 回合的總和, 用 cumsum 相減一次算完 (rolling_stats.py)
+    sum_rewards = rolling_sum(rewards_per_episode, window_size)
 
     plt.figure(figsize=(10, 5))
     plt.plot(sum_rewards)
@@ -241,10 +272,7 @@ def run_sarsa(episodes, is_training=True, render=False):
     env.close()
 
     # 繪圖
-    sum_rewards = np.zeros(episodes)
-    for t in range(episodes):
-        sum_rewards[t] = np.sum(rewards_per_episode[max(0, t-100):(t+1)])
-    plt.plot(sum_rewards)
+    plt.plot(rolling_sum(rewards_per_episode, 100))
     plt.savefig('frozen_lake8x8_sarsa.png')
 
     # 印成功率
@@ -257,14 +285,97 @@ def run_sarsa(episodes, is_training=True, render=False):
             pickle.dump(q, f)
 
 
+def run_vectorized(episodes, is_training=True, render=False, num_envs=64, algorithm="q_learning"):
+    """
+    Q-learning / SARSA on gym.make_vec: num_envs lakes step together and the epsilon-greedy actions and TD updates of
+    all num_envs transitions are array operations. same hyperparameters and pickle files as run / run_sarsa.
+    render is not supported (num_envs windows), it is kept for the same call signature.
+    """
+    env = gym.make_vec('FrozenLake-v1', num_envs=num_envs, map_name="8x8", is_slippery=True)
+    suffix = "" if algorithm == "q_learning" else "_sarsa"
+    n_states, n_actions = env.single_observation_space.n, env.single_action_space.n
+
+    if is_training:
+        q = np.zeros((n_states, n_actions))
+    else:
+        with open(f'frozen_lake8x8{suffix}.pkl', 'rb') as f:
+            q = pickle.load(f)
+
+    alpha = 0.9
+    gamma = 0.9
+    epsilon = 1
+    epsilon_decay_rate = 0.0001
+    rng = np.random.default_rng()
+
+    def choose(states):
+        actions = q[states].argmax(axis=1)
+        if is_training:
+            explore = rng.random(num_envs) < epsilon
+            actions[explore] = rng.integers(n_actions, size=explore.sum())
+        return actions
+
+    rewards_per_episode = []
+    states, _ = env.reset()
+    actions = choose(states)
+    # next-step autoreset: the step after a finished episode only resets that lake, it is not a transition
+    resetting = np.zeros(num_envs, dtype=bool)
+
+    while len(rewards_per_episode) < episodes:
+        new_states, rewards, terminated, truncated, _ = env.step(actions)
+        new_actions = choose(new_states)
+        valid = ~resetting
+        done = (terminated | truncated) & valid
+
+        if is_training and valid.any():
+            s, a, r = states[valid], actions[valid], rewards[valid]
+            if algorithm == "q_learning":
+                next_q = q[new_states[valid]].max(axis=1)
+            else:
+                next_q = q[new_states[valid], new_actions[valid]]
+            td = r + gamma * next_q * ~terminated[valid] - q[s, a]
+            # several lakes can update the same (state, action) in one step: average their TD errors,
+            # a plain q[s, a] += ... would keep only one of them
+            pair = s * n_actions + a
+            total = np.bincount(pair, weights=td, minlength=n_states * n_actions)
+            count = np.bincount(pair, minlength=n_states * n_actions)
+            seen = count > 0
+            q.ravel()[seen] += alpha * total[seen] / count[seen]
+
+        for reward in rewards[done]:
+            rewards_per_episode.append(reward)
+            # epsilon decays once per finished episode, like in run
+            epsilon = max(epsilon - epsilon_decay_rate, 0)
+        if epsilon == 0:
+            alpha = 0.0001
+
+        states, actions, resetting = new_states, new_actions, terminated | truncated
+
+    env.close()
+    rewards_per_episode = np.array(rewards_per_episode[:episodes])
+
+    plt.plot(rolling_sum(rewards_per_episode, 100))
+    plt.savefig(f'frozen_lake8x8{suffix}_vectorized.png')
+
+    if not is_training:
+        print(print_success_rate(rewards_per_episode))
+
+    if is_training:
+        with open(f"frozen_lake8x8{suffix}.pkl", "wb") as f:
+            pickle.dump(q, f)
+
 
 if __name__ == '__main__':
     run_value_iteration(episodes=15000, render=False, load=False)
     run_value_iteration(episodes=2000, render=False, load=True)
     # run_value_iteration(episodes=1, render=True, load=True)
+    # run_value_iteration(episodes=0, load=True)  # only the exact success rate
 
     # run(15000)
     # run(2000, is_training=False, render=False)
 
     # run_sarsa(15000)
     # run_sarsa(2000, is_training=False, render=False)
+
+    # run_vectorized(15000)
+    # run_vectorized(2000, is_training=False)
+    # run_vectorized(15000, algorithm="sarsa")
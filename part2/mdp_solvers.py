@@ -0,0 +1,315 @@
+'''
+Array form of a tabular MDP and the solvers that run on it
+env.unwrapped.P (dict of dict of list of (prob, next_state, reward, terminated)) 只在一開始轉成 NumPy 陣列一次,
+之後每一次 Bellman backup 都是一個批次的陣列運算, 不再用 Python 迴圈走過每個 state / action / transition
+
+python mdp_solvers.py  比較 frozen_lake.value_iteration 和這裡的 solver (SOLVERS) 在不同大小的地圖上花的時間 (和 backup 的次數)
+'''
+import heapq
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix, identity
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    csr_matrix = None
+
+class ArrayMDP:
+    """
+    transitions padded to K = the largest number of outcomes of a (state, action):
+    next_state, prob, terminated: (S, A, K), unused slots have prob 0
+    reward: expected immediate reward R[s, a]
+    """
+    def __init__(self, next_state, prob, reward, terminated):
+        self.next_state = next_state
+        self.prob = prob
+        self.reward = reward
+        self.terminated = terminated
+        self.n_states, self.n_actions = reward.shape
+
+    @classmethod
+    def from_env(cls, env):
+        env = env.unwrapped
+        # toy_text envs keep their transitions as CSR arrays (env.mdp), no need to walk P
+        if hasattr(env, "mdp"):
+            return cls.from_tabular(env.mdp)
+        return cls.from_P(env.P, env.observation_space.n, env.action_space.n)
+
+    @classmethod
+    def from_tabular(cls, mdp):
+        # gymnasium.envs.toy_text.utils.TabularMDP: outcomes of (s, a) are indptr[s * A + a] : indptr[s * A + a + 1]
+        counts = np.diff(mdp.indptr).reshape(mdp.n_states, mdp.n_actions)
+        slots = np.arange(counts.max())
+        used = slots < counts[:, :, None]
+        index = np.where(used, mdp.indptr[:-1].reshape(counts.shape)[:, :, None] + slots, 0)
+        prob = np.where(used, mdp.prob[index], 0.0)
+        reward = (prob * mdp.reward[index]).sum(axis=2)
+        return cls(np.where(used, mdp.next_state[index], 0), prob, reward, np.where(used, mdp.terminated[index], True))
+
+    @classmethod
+    def from_P(cls, P, n_states, n_actions):
+        K = max(len(P[s][a]) for s in range(n_states) for a in range(n_actions))
+        next_state = np.zeros((n_states, n_actions, K), dtype=np.int64)
+        prob = np.zeros((n_states, n_actions, K))
+        rewards = np.zeros((n_states, n_actions, K))
+        terminated = np.ones((n_states, n_actions, K), dtype=bool)
+        for s in range(n_states):
+            for a in range(n_actions):
+                for k, (p, next_s, r, done) in enumerate(P[s][a]):
+                    next_state[s, a, k] = next_s
+                    prob[s, a, k] = p
+                    rewards[s, a, k] = r
+                    terminated[s, a, k] = done
+        return cls(next_state, prob, (prob * rewards).sum(axis=2), terminated)
+
+    def discounted_prob(self, gamma):
+        # gamma * P(s' | s, a), with no bootstrap after a terminating transition
+        return gamma * self.prob * ~self.terminated
+
+    def q_values(self, V, discounted_prob):
+        return self.reward + np.einsum("sak,sak->sa", discounted_prob, V[self.next_state])
+
+    def policy_arrays(self, policy, discounted_prob):
+        # the rows of the chosen actions: R_pi (S,), gamma * P_pi as (S, K) next states / probabilities
+        states = np.arange(self.n_states)
+        return self.reward[states, policy], self.next_state[states, policy], discounted_prob[states, policy]
+
+    def predecessors(self, discounted_prob):
+        # CSR index of the states that bootstrap from s': pred[indptr[s'] : indptr[s' + 1]],
+        # weight = max over actions of gamma * P(s' | pred, a), a change of V(s') changes Q(pred, .) by at most weight * |change|
+        used = discounted_prob > 0
+        states = np.broadcast_to(np.arange(self.n_states)[:, None, None], used.shape)
+        actions = np.broadcast_to(np.arange(self.n_actions)[None, :, None], used.shape)
+        # sum the outcomes of one (pred, a) that lead to the same s', then take the max over a
+        edge, inverse = np.unique((self.next_state[used] * self.n_states + states[used]) * self.n_actions + actions[used], return_inverse=True)
+        weight = np.bincount(inverse, weights=discounted_prob[used])
+        edges, first = np.unique(edge // self.n_actions, return_index=True)
+        weight = np.maximum.reduceat(weight, first)
+        indptr = np.zeros(self.n_states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges // self.n_states, minlength=self.n_states), out=indptr[1:])
+        return indptr, edges % self.n_states, weight
+
+def evaluate_policy(mdp: ArrayMDP, policy, gamma=0.99):
+    """
+    exact V of a policy: solve (I - gamma * P_pi) V = R_pi
+    sparse solve with scipy, dense np.linalg.solve without it
+    """
+    reward, next_state, discounted_prob = mdp.policy_arrays(policy, mdp.discounted_prob(gamma))
+    n = mdp.n_states
+    rows = np.repeat(np.arange(n), next_state.shape[1])
+    if csr_matrix is not None:
+        # duplicate (row, col) entries are summed
+        P_pi = csr_matrix((discounted_prob.ravel(), (rows, next_state.ravel())), shape=(n, n))
+        return spsolve((identity(n, format="csr") - P_pi).tocsc(), reward)
+    A = np.eye(n)
+    np.add.at(A, (rows, next_state.ravel()), -discounted_prob.ravel())
+    return np.linalg.solve(A, reward)
+
+def expected_return(mdp: ArrayMDP, policy, horizon=None):
+    """
+    exact expected (undiscounted) return of the policy from every state, no sampled episodes and no variance
+    with FrozenLake's rewards (1 for reaching the goal, 0 otherwise) it is the probability of reaching the goal
+    horizon=None: until termination, the policy turns the MDP into an absorbing Markov chain, solve (I - P_pi) V = R_pi
+                  over the states that can still terminate, the others loop forever and get 0
+                  (ValueError if one of them has a non-zero reward, its return would be infinite)
+    horizon=h: within h steps (the TimeLimit truncation of the env), h backups of the policy
+    """
+    reward, next_state, prob = mdp.policy_arrays(policy, mdp.discounted_prob(1.0))
+    if horizon is not None:
+        V = np.zeros(mdp.n_states)
+        for _ in range(horizon):
+            V = reward + (prob * V[next_state]).sum(axis=1)
+        return V
+
+    # states from which a terminating transition is reachable, grown backwards from the states that can terminate
+    used = prob > 0
+    can_end = (prob.sum(axis=1) < 1 - 1e-12)
+    while True:
+        grown = can_end | (used & can_end[next_state]).any(axis=1)
+        if np.array_equal(grown, can_end):
+            break
+        can_end = grown
+    if np.any(reward[~can_end] != 0):
+        # e.g. a -1 step reward in a loop: the return is infinite, 0 would be wrong
+        raise ValueError("the policy never terminates from some states that have a non-zero reward, use a horizon")
+    states = np.flatnonzero(can_end)
+    # renumber the kept states, transitions into the others add nothing (their value is 0)
+    index = np.full(mdp.n_states, -1)
+    index[states] = np.arange(len(states))
+    cols = index[next_state[states]]
+    keep = used[states] & (cols >= 0)
+    rows = np.broadcast_to(np.arange(len(states))[:, None], keep.shape)[keep]
+    n = len(states)
+    V = np.zeros(mdp.n_states)
+    if csr_matrix is not None:
+        P_pi = csr_matrix((prob[states][keep], (rows, cols[keep])), shape=(n, n))
+        V[states] = spsolve((identity(n, format="csr") - P_pi).tocsc(), reward[states])
+    else:
+        A = np.eye(n)
+        np.add.at(A, (rows, cols[keep]), -prob[states][keep])
+        V[states] = np.linalg.solve(A, reward[states])
+    return V
+
+def value_iteration(mdp: ArrayMDP, gamma=0.99, theta=1e-8):
+    """
+    Value Iteration on the arrays: one sweep is a single batched backup of all states (synchronous).
+    returns the greedy policy, V and the number of sweeps
+    """
+    discounted_prob = mdp.discounted_prob(gamma)
+    V = np.zeros(mdp.n_states)
+    sweeps = 0
+    while True:
+        sweeps += 1
+        new_V = mdp.q_values(V, discounted_prob).max(axis=1)
+        delta = np.abs(new_V - V).max()
+        V = new_V
+        if delta < theta:
+            break
+    policy = mdp.q_values(V, discounted_prob).argmax(axis=1)
+    return policy, V, sweeps
+
+def _improve(Q, policy):
+    # greedy policy, an action is only replaced by a strictly better one (no flipping between equal actions)
+    states = np.arange(len(policy))
+    best = Q.argmax(axis=1)
+    keep = Q[states, policy] >= Q[states, best] - 1e-12
+    return np.where(keep, policy, best)
+
+def policy_iteration(mdp: ArrayMDP, gamma=0.99, max_iterations=1000):
+    """
+    Policy Iteration: exact evaluation (linear solve, see evaluate_policy) + greedy improvement until the policy is stable.
+    returns the policy, V and the number of policy evaluations
+    """
+    discounted_prob = mdp.discounted_prob(gamma)
+    policy = np.zeros(mdp.n_states, dtype=np.int64)
+    for iterations in range(1, max_iterations + 1):
+        V = evaluate_policy(mdp, policy, gamma)
+        new_policy = _improve(mdp.q_values(V, discounted_prob), policy)
+        if np.array_equal(new_policy, policy):
+            break
+        policy = new_policy
+    return policy, V, iterations
+
+def modified_policy_iteration(mdp: ArrayMDP, gamma=0.99, theta=1e-8, k=20):
+    """
+    Modified Policy Iteration: every greedy backup is followed by k - 1 cheap backups of the greedy policy
+    (partial evaluation, no max over actions), stops when a greedy backup changes V by less than theta.
+    k = 1 is value iteration, a large k approaches policy iteration.
+    returns the policy, V and the number of sweeps (greedy + evaluation)
+    """
+    discounted_prob = mdp.discounted_prob(gamma)
+    V = np.zeros(mdp.n_states)
+    sweeps = 0
+    while True:
+        sweeps += 1
+        Q = mdp.q_values(V, discounted_prob)
+        policy = Q.argmax(axis=1)
+        new_V = Q.max(axis=1)
+        delta = np.abs(new_V - V).max()
+        V = new_V
+        if delta < theta:
+            break
+        reward, next_state, policy_prob = mdp.policy_arrays(policy, discounted_prob)
+        for _ in range(k - 1):
+            V = reward + (policy_prob * V[next_state]).sum(axis=1)
+        sweeps += k - 1
+    policy = mdp.q_values(V, discounted_prob).argmax(axis=1)
+    return policy, V, sweeps
+
+def prioritized_sweeping(mdp: ArrayMDP, gamma=0.99, theta=1e-8):
+    """
+    Prioritized sweeping (asynchronous, in place): instead of sweeping every state, always back up the state with the
+    largest Bellman residual |max_a Q(s, a) - V(s)|. After V(s) changes only its predecessors can get a new residual,
+    they are the only states that are checked and pushed into the queue again. stops when no residual is >= theta.
+    returns the greedy policy, V and the number of single-state backups
+    """
+    discounted_prob = mdp.discounted_prob(gamma)
+    pred_indptr, pred, weight = mdp.predecessors(discounted_prob)
+    # a single backup touches only a few numbers, plain Python lists are much cheaper than NumPy calls here
+    rows = [
+        [(r, list(zip(p, n))) for r, p, n in zip(reward, prob, next_s)]
+        for reward, prob, next_s in zip(mdp.reward.tolist(), discounted_prob.tolist(), mdp.next_state.tolist())
+    ]
+    predecessors = [
+        list(zip(pred[pred_indptr[s]:pred_indptr[s + 1]].tolist(), weight[pred_indptr[s]:pred_indptr[s + 1]].tolist()))
+        for s in range(mdp.n_states)
+    ]
+    V = [0.0] * mdp.n_states
+
+    def backup(s):
+        return max(r + sum(p * V[n] for p, n in outcomes) for r, outcomes in rows[s])
+
+    # priority[s] >= the Bellman residual of s: exact after a backup of s, then raised by weight * |change| for every
+    # change of a successor (triangle inequality), so the predecessors are not backed up just to get their residual
+    priority = [abs(backup(s) - V[s]) for s in range(mdp.n_states)]
+    # max-heap of (-priority, state), an entry is stale when priority[state] has changed since it was pushed
+    heap = [(-r, s) for s, r in enumerate(priority) if r >= theta]
+    heapq.heapify(heap)
+    backups = 0
+    while heap:
+        r, s = heapq.heappop(heap)
+        if -r != priority[s]:
+            continue
+        backups += 1
+        new_v = backup(s)
+        change = abs(new_v - V[s])
+        V[s] = new_v
+        priority[s] = 0.0
+        for p, w in predecessors[s]:
+            r = priority[p] + w * change
+            priority[p] = r
+            if r >= theta:
+                heapq.heappush(heap, (-r, p))
+    V = np.array(V)
+    policy = mdp.q_values(V, discounted_prob).argmax(axis=1)
+    return policy, V, backups
+
+# solvers selectable by name, all take (mdp, gamma=...) and return (policy, V, sweeps or iterations)
+SOLVERS = {
+    "value_iteration": value_iteration,
+    "policy_iteration": policy_iteration,
+    "modified_policy_iteration": modified_policy_iteration,
+    "prioritized_sweeping": prioritized_sweeping,
+}
+
+if __name__ == '__main__':
+    import gymnasium as gym
+    import time
+    from gymnasium.envs.toy_text.frozen_lake import generate_random_map
+    import frozen_lake
+
+    for size in (8, 16, 32, 64):
+        env = gym.make('FrozenLake-v1', desc=generate_random_map(size=size, p=0.8, seed=42), is_slippery=True)
+        t0 = time.perf_counter()
+        mdp = ArrayMDP.from_env(env)
+        print(f"MAP {size}*{size}: compile {1000 * (time.perf_counter() - t0):.1f} ms")
+        reference = None
+        for name, solver in SOLVERS.items():
+            t0 = time.perf_counter()
+            policy, V, sweeps = solver(mdp)
+            elapsed = time.perf_counter() - t0
+            if reference is None:
+                reference = V
+            print(f"   {name:<27}{1000 * elapsed:9.1f} ms  {sweeps:6d} sweeps / evaluations / backups  max |V - V_vi| {np.abs(V - reference).max():.1e}")
+        if size <= 32:
+            t0 = time.perf_counter()
+            loop_policy = frozen_lake.value_iteration(env)
+            elapsed = time.perf_counter() - t0
+            # the policies can pick different actions only where several actions have the same value
+            Q = mdp.q_values(reference, mdp.discounted_prob(0.99))
+            same = np.allclose(Q[np.arange(mdp.n_states), loop_policy], reference, atol=1e-6)
+            print(f"   {'loop value_iteration':<27}{1000 * elapsed:9.1f} ms  same values: {same}")
+        env.close()
+
+    # deterministic moves: value changes travel along single paths, prioritized sweeping backs up only those states
+    for size in (32, 64, 128):
+        env = gym.make('FrozenLake-v1', desc=generate_random_map(size=size, p=0.8, seed=42), is_slippery=False)
+        mdp = ArrayMDP.from_env(env)
+        print(f"MAP {size}*{size} not slippery:")
+        for name in ("value_iteration", "prioritized_sweeping"):
+            t0 = time.perf_counter()
+            policy, V, sweeps = SOLVERS[name](mdp)
+            elapsed = time.perf_counter() - t0
+            backups = sweeps * mdp.n_states if name == "value_iteration" else sweeps
+            print(f"   {name:<27}{1000 * elapsed:9.1f} ms  {backups:8d} state backups")
+        env.close()
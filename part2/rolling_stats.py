@@ -0,0 +1,53 @@
+'''
+Rolling-window statistics of the episode rewards for the training curves (a copy lives in part1 and part2, next to the scripts that import it)
+每個 episode 只做 O(1) 的更新, 訓練途中就可以查詢最近 window 個 episode 的總和 / 平均 / 成功率,
+整條曲線用 cumsum 相減一次算出 (O(episodes)), 不再每個 t 都切一段陣列重新加總
+'''
+from array import array
+import numpy as np
+
+def rolling_sum(values, window=100):
+    # sum of the last `window` values at every t (fewer at the start)
+    total = np.cumsum(values, dtype=np.float64)
+    total[window:] -= total[:-window].copy()
+    return total
+
+def rolling_mean(values, window=100):
+    return rolling_sum(values, window) / np.minimum(np.arange(1, len(values) + 1), window)
+
+class RollingStats:
+    """
+    streaming version: add() one episode reward at a time, sum / mean / success_rate are the last `window` episodes
+    the rewards of the toy envs are integers, so the running sum does not drift
+    """
+    def __init__(self, window=100):
+        self.window = window
+        self.values = array('d')
+        self.sum = 0.0
+        self.successes = 0      # episodes with a reward > 0 in the window
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, value):
+        self.values.append(value)
+        self.sum += value
+        self.successes += value > 0
+        if len(self.values) > self.window:
+            old = self.values[-self.window - 1]
+            self.sum -= old
+            self.successes -= old > 0
+
+    @property
+    def mean(self):
+        return self.sum / min(len(self.values), self.window) if self.values else 0.0
+
+    @property
+    def success_rate(self):
+        return self.successes / min(len(self.values), self.window) if self.values else 0.0
+
+    def sums(self):
+        return rolling_sum(np.frombuffer(self.values), self.window)
+
+    def means(self):
+        return rolling_mean(np.frombuffer(self.values), self.window)
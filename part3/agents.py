@@ -1,72 +1,53 @@
 from abc import ABC, abstractmethod
-import random
+import numpy as np
 from warehouse_robot import RobotAction
-import heapq
+from planners import PLANNERS
 
-class AStarPlanner:
-    def __init__(self, grid_rows, grid_cols):
-        self.rows = grid_rows
-        self.cols = grid_cols
+ACTIONS = list(RobotAction)
 
-    def heuristic(self, pos1, pos2):
-        # Manhattan distance
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
-
-    def find_path(self, start_pos, goal_pos, blocked_pos=None):
-
-        if start_pos == goal_pos:
-            return None
-
-        priority_queue = [(0, 0, start_pos[0], start_pos[1])]
-        g_cost = {tuple(start_pos): 0}
-        came_from = {}
-        
-        blocked_tuple = tuple(blocked_pos) if blocked_pos else None
-        
-        while priority_queue:
-            f_cost, g_current, r, c = heapq.heappop(priority_queue)
-            current_pos = (r, c)
-
-            if list(current_pos) == goal_pos:
-                # rebuilt path
-                path = []
-                while current_pos in came_from:
-                    path.append(list(current_pos))
-                    current_pos = came_from[current_pos]
-                path.append(list(start_pos))
-                return path[::-1] 
-
-            # go through 4 neighbor
-            for dr, dc, action in [(-1, 0, RobotAction.UP), (1, 0, RobotAction.DOWN), (0, -1, RobotAction.LEFT), (0, 1, RobotAction.RIGHT)]:
-                neighbor_r, neighbor_c = r + dr, c + dc
-                neighbor_pos = (neighbor_r, neighbor_c)
-
-                if 0 <= neighbor_r < self.rows and 0 <= neighbor_c < self.cols:
-                    # avoid collapse
-                    if blocked_tuple and neighbor_pos == blocked_tuple:
-                        continue 
-                        
-                    new_g_cost = g_current + 1 
-
-                    if new_g_cost < g_cost.get(neighbor_pos, float('inf')):
-                        g_cost[neighbor_pos] = new_g_cost
-                        f_cost = new_g_cost + self.heuristic(list(neighbor_pos), goal_pos)
-                        heapq.heappush(priority_queue, (f_cost, new_g_cost, neighbor_r, neighbor_c))
-                        came_from[neighbor_pos] = current_pos
-        
-        return None
-    
 class RobotAgent(ABC):
-    def __init__(self, name, grid_rows=5, grid_cols=5):
+    def __init__(self, name, grid_rows=5, grid_cols=5, planner="astar", obstacles=None, profile=False, seed=None):
         self.name = name
-        self.planner = AStarPlanner(grid_rows, grid_cols)
-        self.current_path = []
-        self.last_target_pos = None
+        # random moves (no path / stay in place) come from the agent's own generator, see reset_agent(seed)
+        self.rng = np.random.default_rng(seed)
+        # profile=True: the planner keeps PlannerStats in self.planner.stats
+        self.planner = PLANNERS[planner](grid_rows, grid_cols, obstacles=obstacles, profile=profile)
+        # planners with next_step (distance_field) pick every move with one table lookup instead of a kept path
+        self.step_planner = hasattr(self.planner, "next_step")
+        self.reset_agent()
         
-    def reset_agent(self):
+    def reset_agent(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
         #clean cache
         self.current_path = []
         self.last_target_pos = None
+        # per-mission counters (metrics.py)
+        self.planner_calls = 0
+        self.replans = 0
+        # planners that keep a search tree between calls start empty, so a mission does not depend on the ones before it
+        if hasattr(self.planner, "reset"):
+            self.planner.reset()
+
+    def _find_path(self, start_pos, goal_pos, blocked_pos=None):
+        self.planner_calls += 1
+        if self.last_target_pos is not None:
+            self.replans += 1
+        return self.planner.find_path(start_pos, goal_pos, blocked_pos=blocked_pos)
+
+    def _next_step_action(self, start_pos, goal_pos, blocked_pos=None):
+        # one planner call per move, always with the current blocked cell, nothing is kept in current_path
+        self.planner_calls += 1
+        if self.last_target_pos is not None:
+            self.replans += 1
+        self.last_target_pos = goal_pos
+        next_pos = self.planner.next_step(start_pos, goal_pos, blocked_pos=blocked_pos)
+        if next_pos is None:
+            return self._random_action()
+        return self._pos_to_action(start_pos, next_pos)
+
+    def _random_action(self):
+        return ACTIONS[self.rng.integers(len(ACTIONS))]
 
     @abstractmethod
     def get_action(self, my_index, all_robot_positions, target_pos, grid_rows, grid_cols):
@@ -81,7 +62,7 @@ class RobotAgent(ABC):
         if dr == 0 and dc == -1: return RobotAction.LEFT
         
         # stay in same place
-        return random.choice(list(RobotAction))
+        return self._random_action()
 
 # Bot A: find kaggle directly
 class BotTypeA(RobotAgent):
@@ -89,13 +70,16 @@ class BotTypeA(RobotAgent):
         my_pos = all_robot_positions[my_index]
         other_index = 1 - my_index
         other_pos = all_robot_positions[other_index]
-        
+
+        if self.step_planner:
+            return self._next_step_action(my_pos, target_pos, blocked_pos=other_pos)
+
         # keep original path
         if self.last_target_pos == target_pos and self.current_path:
             next_pos = self.current_path.pop(0)
             return self._pos_to_action(my_pos, next_pos)
 
-        path = self.planner.find_path(my_pos, target_pos, blocked_pos=other_pos)
+        path = self._find_path(my_pos, target_pos, blocked_pos=other_pos)
 
         if path and len(path) > 1:
             self.current_path = path[1:]
@@ -103,7 +87,7 @@ class BotTypeA(RobotAgent):
             next_pos = self.current_path.pop(0)
             return self._pos_to_action(my_pos, next_pos)
         else:
-            return random.choice(list(RobotAction))
+            return self._random_action()
 
 
 # Bot B: approch A. if the distance to kaggle is less than 5 step, B will change to find kaggle
@@ -123,13 +107,16 @@ class BotTypeB(RobotAgent):
             goal = bot_a_pos
             mode_text = "ToBotA"
 
+        if self.step_planner:
+            return self._next_step_action(my_pos, goal, blocked_pos=bot_a_pos)
+
         # if mode change, then recalculate
         if self.last_target_pos == goal and self.current_path:
             next_pos = self.current_path.pop(0)
             return self._pos_to_action(my_pos, next_pos)
         
         # avoid A
-        path = self.planner.find_path(my_pos, goal, blocked_pos=bot_a_pos)
+        path = self._find_path(my_pos, goal, blocked_pos=bot_a_pos)
 
         if path and len(path) > 1:
             self.current_path = path[1:]
@@ -137,4 +124,32 @@ class BotTypeB(RobotAgent):
             next_pos = self.current_path.pop(0)
             return self._pos_to_action(my_pos, next_pos)
         else:
-            return random.choice(list(RobotAction))
\ No newline at end of file
+            return self._random_action()
+
+# Solo Bot A: Bot B stay in same place and is not a block
+class BotTypeA_Solo(BotTypeA):
+    def get_action(self, my_index, all_robot_positions, target_pos, grid_rows, grid_cols):
+        
+        if my_index == 1:
+            return RobotAction.DOWN
+        
+        my_pos = all_robot_positions[my_index]
+
+        if self.step_planner:
+            return self._next_step_action(my_pos, target_pos, blocked_pos=None)
+        
+        # keep original path
+        if self.last_target_pos == target_pos and self.current_path:
+            next_pos = self.current_path.pop(0)
+            return self._pos_to_action(my_pos, next_pos)
+
+        # let Bot B not become a block
+        path = self._find_path(my_pos, target_pos, blocked_pos=None)
+
+        if path and len(path) > 1:
+            self.current_path = path[1:]
+            self.last_target_pos = target_pos
+            next_pos = self.current_path.pop(0)
+            return self._pos_to_action(my_pos, next_pos)
+        else:
+            return self._random_action()
\ No newline at end of file
@@ -0,0 +1,54 @@
+'''
+Benchmark of the AStarPlanner search strategies (astar, weighted, jps, bidirectional)
+每種地圖大小 (GRID_R x GRID_C) 各跑一個空地圖和一個有貨架的倉庫,
+用同一組隨機的 (起點, 終點, 擋路的機器人) 比較: 每次規劃的時間、展開 / 放進 open list 的節點數、路徑長度
+路徑長度和 astar 不同的次數也會列出來 (只有 weighted 可能不同)
+'''
+from planners import AStarPlanner, SEARCH_STRATEGIES
+from warehouse_map import generate_warehouse_map
+import random
+
+# map sizes (GRID_R, GRID_C), the first one is the default map of main.py
+MAP_SIZES = [(20, 20), (50, 50), (100, 100)]
+QUERIES = 200
+SEED = 0
+
+def make_queries(grid_rows, grid_cols, obstacles, num_queries, rng):
+    free = [[r, c] for r in range(grid_rows) for c in range(grid_cols) if obstacles is None or not obstacles[r, c]]
+    queries = []
+    while len(queries) < num_queries:
+        start, goal, blocked = (list(rng.choice(free)) for _ in range(3))
+        if start != goal and blocked != goal:
+            queries.append((start, goal, blocked))
+    return queries
+
+def run_benchmark(grid_rows, grid_cols, obstacles, queries):
+    results = {}
+    reference = None
+    for strategy in SEARCH_STRATEGIES:
+        planner = AStarPlanner(grid_rows, grid_cols, obstacles=obstacles, profile=True, strategy=strategy)
+        lengths = [len(path) - 1 if path else -1 for path in (planner.find_path(*query) for query in queries)]
+        if reference is None:
+            reference = lengths
+        stats = planner.stats
+        found = [length for length in lengths if length >= 0]
+        results[strategy] = {
+            "ms_per_call": 1000 * stats.time / stats.calls,
+            "expanded_per_call": stats.nodes_expanded / stats.calls,
+            "pushed_per_call": stats.nodes_pushed / stats.calls,
+            "avg_length": sum(found) / len(found) if found else 0,
+            "different_length": sum(1 for length, best in zip(lengths, reference) if length != best),
+        }
+    return results
+
+if __name__ == "__main__":
+    rng = random.Random(SEED)
+    for grid_rows, grid_cols in MAP_SIZES:
+        for layout in ("empty", "warehouse"):
+            obstacles = generate_warehouse_map(grid_rows, grid_cols).occupancy if layout == "warehouse" else None
+            queries = make_queries(grid_rows, grid_cols, obstacles, QUERIES, rng)
+            print(f"MAP {grid_rows}*{grid_cols} ({layout}), {QUERIES} queries")
+            for strategy, result in run_benchmark(grid_rows, grid_cols, obstacles, queries).items():
+                print(f"   {strategy:<14}{result['ms_per_call']:8.3f} ms/call  expanded {result['expanded_per_call']:8.1f}  "
+                      f"pushed {result['pushed_per_call']:8.1f}  avg length {result['avg_length']:6.1f}  "
+                      f"different length {result['different_length']}")
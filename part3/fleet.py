@@ -0,0 +1,298 @@
+'''
+Part 3 : N-robot fleet with cooperative path planning
+Windowed Hierarchical Cooperative A* (WHCA*):
+1. 每台機器人在 (cell, time) 空間裡做 A*, 只規劃未來 window 步
+2. 規劃好的路徑寫進 reservation table, 後面規劃的機器人會避開 (同一格 / 互換位置都不行)
+3. heuristic 用 DistanceFieldPlanner 的 BFS 距離 (只考慮貨架和牆)
+'''
+from warehouse_robot import WarehouseRobot, RobotAction
+from planners import DistanceFieldPlanner, build_neighbor_table
+import heapq
+import random
+import time
+
+class ReservationTable:
+    """
+    space-time reservations with absolute time steps
+    vertex: (t, cell) -> robot     the robot is on cell at time t
+    edge:   (t, a, b) -> robot     the robot moves a -> b between t and t+1
+    parked: cell -> (robot, t)     the robot stays on cell from time t on (end of its path)
+    """
+    def __init__(self):
+        self.vertex = {}
+        self.edge = {}
+        self.parked = {}
+
+    def clear(self):
+        self.vertex.clear()
+        self.edge.clear()
+        self.parked.clear()
+
+    def reserve(self, robot, path, t0):
+        for k, cell in enumerate(path):
+            self.vertex[(t0 + k, cell)] = robot
+            if k > 0 and path[k - 1] != cell:
+                self.edge[(t0 + k - 1, path[k - 1], cell)] = robot
+        self.parked[path[-1]] = (robot, t0 + len(path) - 1)
+
+    def release(self, robot, path, t0):
+        for k, cell in enumerate(path):
+            if self.vertex.get((t0 + k, cell)) == robot:
+                del self.vertex[(t0 + k, cell)]
+            if k > 0 and self.edge.get((t0 + k - 1, path[k - 1], cell)) == robot:
+                del self.edge[(t0 + k - 1, path[k - 1], cell)]
+        if self.parked.get(path[-1], (None,))[0] == robot:
+            del self.parked[path[-1]]
+
+    def is_free(self, robot, cell, t):
+        other = self.vertex.get((t, cell))
+        if other is not None and other != robot:
+            return False
+        parked = self.parked.get(cell)
+        return parked is None or parked[0] == robot or t < parked[1]
+
+    def can_move(self, robot, a, b, t):
+        # a -> b between t and t+1, nobody may move b -> a at the same time
+        other = self.edge.get((t, b, a))
+        return (other is None or other == robot) and self.is_free(robot, b, t + 1)
+
+    def free_from(self, robot, cell, t, horizon):
+        # can the robot stay on cell from t until the horizon
+        return all(self.is_free(robot, cell, k) for k in range(t, horizon + 1))
+
+class CooperativePlanner:
+    def __init__(self, grid_rows, grid_cols, num_robots, obstacles=None, window=16):
+        self.rows = grid_rows
+        self.cols = grid_cols
+        self.num_robots = num_robots
+        self.window = window
+        self.distance = DistanceFieldPlanner(grid_rows, grid_cols, obstacles=obstacles, cache_size=4 * num_robots)
+        self._neighbors = build_neighbor_table(grid_rows, grid_cols, obstacles)
+        self.reset()
+
+    def reset(self):
+        self.time = 0
+        self.table = ReservationTable()
+        self.paths = [None] * self.num_robots    # planned cells from path_start on
+        self.path_start = [0] * self.num_robots
+        self.goals = [None] * self.num_robots
+
+        # statistics
+        self.searches = 0
+        self.held = 0
+        self.step_times = []
+
+    def _cell(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def _search(self, robot, start, goal):
+        """
+        space-time A* from (start, now) for at most window steps
+        return the cells of the robot from now on (index 0 is start)
+        """
+        self.searches += 1
+        t0 = self.time
+        horizon = t0 + self.window
+        table = self.table
+
+        if goal is None:
+            return [start]
+        dist = self.distance.distance_field([goal // self.cols, goal % self.cols])[0]
+        if dist[start] == -1:
+            return [start]
+
+        # (f, -g, cell, t): ties prefer deeper nodes
+        open_list = [(dist[start], 0, start, t0)]
+        parent = {(start, t0): None}
+        neighbors = self._neighbors
+
+        while open_list:
+            f, neg_g, cell, t = heapq.heappop(open_list)
+
+            if (cell == goal and table.free_from(robot, cell, t, horizon)) or t == horizon:
+                path = []
+                node = (cell, t)
+                while node is not None:
+                    path.append(node[0])
+                    node = parent[node]
+                return path[::-1]
+
+            nt = t + 1
+            for n in neighbors[cell] + (cell,):
+                if (n, nt) in parent or dist[n] == -1:
+                    continue
+                if n == cell:
+                    if not table.is_free(robot, n, nt):
+                        continue
+                elif not table.can_move(robot, cell, n, t):
+                    continue
+                parent[(n, nt)] = (cell, t)
+                heapq.heappush(open_list, (nt - t0 + dist[n], t0 - nt, n, nt))
+
+        # trapped: stay and let the conflict check hold the others
+        return [start]
+
+    def _replan(self, robot, cell, goal):
+        path = self._search(robot, cell, goal)
+        self.paths[robot] = path
+        self.path_start[robot] = self.time
+        self.goals[robot] = goal
+        self.table.reserve(robot, path, self.time)
+
+    def _planned_cell(self, robot, t):
+        path = self.paths[robot]
+        k = t - self.path_start[robot]
+        return path[min(k, len(path) - 1)]
+
+    def _rebuild_table(self):
+        # drop reservations in the past
+        self.table.clear()
+        for robot, path in enumerate(self.paths):
+            k = self.time - self.path_start[robot]
+            if k >= len(path):
+                path = [path[-1]]
+            elif k > 0:
+                path = path[k:]
+            self.paths[robot] = path
+            self.path_start[robot] = self.time
+            self.table.reserve(robot, path, self.time)
+
+    def plan_step(self, robot_positions, goals):
+        """
+        robot_positions: [[r, c], ...], goals: [[r, c] or None, ...] (None: stay)
+        return the action of every robot, None means wait
+        """
+        start_time = time.perf_counter()
+        cells = [self._cell(pos) for pos in robot_positions]
+        goal_cells = [self._cell(goal) if goal is not None else None for goal in goals]
+
+        if self.time > 0 and self.time % (4 * self.window) == 0:
+            self._rebuild_table()
+
+        # rotate priorities so no robot is always planned last
+        offset = self.time % self.num_robots
+        order = [(offset + k) % self.num_robots for k in range(self.num_robots)]
+        replan = []
+        for robot in order:
+            path = self.paths[robot]
+            if (path is None
+                    or goal_cells[robot] != self.goals[robot]
+                    or self._planned_cell(robot, self.time) != cells[robot]
+                    or (path[-1] != goal_cells[robot] and self.path_start[robot] + len(path) - 1 - self.time < self.window // 2)):
+                replan.append(robot)
+
+        # release first, so robots replanned later do not block the ones with higher priority
+        for robot in replan:
+            if self.paths[robot] is not None:
+                self.table.release(robot, self.paths[robot], self.path_start[robot])
+        for robot in replan:
+            self._replan(robot, cells[robot], goal_cells[robot])
+
+        # safety net: hold robots whose move would still collide
+        next_cells = [self._planned_cell(robot, self.time + 1) for robot in range(self.num_robots)]
+        changed = True
+        while changed:
+            changed = False
+            occupied = {}
+            for robot in order:
+                cell = next_cells[robot]
+                if cell in occupied:
+                    # the robot that does not move has the right of way
+                    other = occupied[cell]
+                    loser = robot if next_cells[robot] != cells[robot] else other
+                    next_cells[loser] = cells[loser]
+                    self.held += 1
+                    changed = True
+                    break
+                occupied[cell] = robot
+            if changed:
+                continue
+            for robot in range(self.num_robots):
+                other = occupied.get(cells[robot])
+                if other is not None and other != robot and next_cells[robot] == cells[other]:
+                    next_cells[robot] = cells[robot]
+                    next_cells[other] = cells[other]
+                    self.held += 2
+                    changed = True
+                    break
+
+        actions = [self._to_action(cells[robot], next_cells[robot]) for robot in range(self.num_robots)]
+        self.time += 1
+        self.step_times.append(time.perf_counter() - start_time)
+        return actions
+
+    def _to_action(self, cell, next_cell):
+        diff = next_cell - cell
+        if diff == 0:
+            return None
+        if diff == -self.cols: return RobotAction.UP
+        if diff == self.cols: return RobotAction.DOWN
+        if diff == -1: return RobotAction.LEFT
+        return RobotAction.RIGHT
+
+def run_fleet(num_robots=50, grid_rows=64, grid_cols=64, steps=300, window=16, warehouse_map=None, seed=0):
+    """
+    每台機器人有自己的目標, 到達後換一個新的隨機目標
+    回傳送達次數、碰撞次數與每一步的規劃時間
+    """
+    rng = random.Random(seed)
+    env = WarehouseRobot(grid_rows=grid_rows, grid_cols=grid_cols, warehouse_map=warehouse_map, num_robots=num_robots)
+    planner = CooperativePlanner(env.grid_rows, env.grid_cols, num_robots, obstacles=env.obstacles, window=window)
+
+    free_cells = env.free_cells or [[r, c] for r in range(env.grid_rows) for c in range(env.grid_cols)]
+
+    def new_goal(goals):
+        while True:
+            goal = list(rng.choice(free_cells))
+            if goal not in goals:
+                return goal
+
+    goals = []
+    for _ in range(num_robots):
+        goals.append(new_goal(goals))
+
+    deliveries = 0
+    collisions = 0
+    for _ in range(steps):
+        previous = [pos.copy() for pos in env.robot_positions]
+        actions = planner.plan_step(env.robot_positions, goals)
+        for i, action in enumerate(actions):
+            if action is not None:
+                env.perform_action(i, action)
+
+        # check vertex and swap collisions
+        positions = [tuple(pos) for pos in env.robot_positions]
+        collisions += len(positions) - len(set(positions))
+        before = {tuple(pos): i for i, pos in enumerate(previous)}
+        for i, pos in enumerate(positions):
+            j = before.get(pos)
+            if j is not None and j != i and tuple(env.robot_positions[j]) == tuple(previous[i]):
+                collisions += 1
+
+        for i, pos in enumerate(env.robot_positions):
+            if pos == goals[i]:
+                deliveries += 1
+                goals[i] = new_goal(goals)
+
+    step_times = sorted(planner.step_times)
+    return {
+        "deliveries": deliveries,
+        "collisions": collisions,
+        "held": planner.held,
+        "searches": planner.searches,
+        "avg_plan_ms": 1000 * sum(step_times) / len(step_times),
+        "p95_plan_ms": 1000 * step_times[int(0.95 * (len(step_times) - 1))],
+        "max_plan_ms": 1000 * step_times[-1],
+    }
+
+if __name__ == "__main__":
+    from warehouse_map import generate_warehouse_map
+
+    NUM_ROBOTS = 50
+    GRID_R, GRID_C = 64, 64
+    STEPS = 300
+
+    result = run_fleet(NUM_ROBOTS, GRID_R, GRID_C, steps=STEPS, warehouse_map=generate_warehouse_map(GRID_R, GRID_C))
+    print(f"FLEET {NUM_ROBOTS} robots, MAP: {GRID_R}*{GRID_C}, {STEPS} steps")
+    print(f"   Deliveries: {result['deliveries']}  Collisions: {result['collisions']}  Held moves: {result['held']}")
+    print(f"   Planning time per step: avg {result['avg_plan_ms']:.2f} ms, p95 {result['p95_plan_ms']:.2f} ms, max {result['max_plan_ms']:.2f} ms")
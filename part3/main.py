@@ -1,38 +1,98 @@
 '''
 Part 3 : 雙機器人協作任務
 '''
-from warehouse_robot import WarehouseRobot, RobotAction
-from agents import BotTypeA, BotTypeB
+from warehouse_robot import WarehouseRobot
+from agents import BotTypeA, BotTypeB, BotTypeA_Solo
+from warehouse_map import WarehouseMap
+from metrics import MissionRecorder, format_summary
+from mission_log import MissionLog
+from planners import PlannerStats
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import time
-import random
 import sys
-import pygame 
+import os
 
 RENDER_FLAG = 0 # 0 for experienment mdoe; 1 for render mdoe
 
 # map size
 GRID_R, GRID_C = 20, 20
 
+# warehouse layout with shelves / walls (see warehouse_map.py), None for an empty floor
+# the map size overrides GRID_R and GRID_C
+MAP_FILE = None # e.g. "maps/warehouse_20x20.txt"
+WAREHOUSE_MAP = WarehouseMap.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), MAP_FILE)) if MAP_FILE else None
+OBSTACLES = WAREHOUSE_MAP.occupancy if WAREHOUSE_MAP is not None else None
+if WAREHOUSE_MAP is not None:
+    GRID_R, GRID_C = WAREHOUSE_MAP.grid_rows, WAREHOUSE_MAP.grid_cols
+
 if RENDER_FLAG == 1:
     print("--- RENDER MODE ---")
     FPS = 4
     MAX_MISSIONS = 1
     MAX_STEPS_PER_MISSION = 500 # max step
+    NUM_WORKERS = 0
 else:
     print("--- EXPERIENMENT MODE ---")
     FPS = 0
     MAX_MISSIONS = 1000
     MAX_STEPS_PER_MISSION = 300
+    NUM_WORKERS = os.cpu_count() or 1 # process pool size; 0 runs the missions in this process (same seeds, same results)
+
+# path planner of every bot: "astar", "array_astar" (A* on flat cell ids with reused buffers) or "distance_field" (BFS distance field, cached per goal)
+PLANNER = "astar"
+# planner of Bot B, whose goal (Bot A or the kaggle) and blocked cell (Bot A) move every step:
+# "incremental_astar" keeps its search tree between steps and only repairs it
+FOLLOWER_PLANNER = "incremental_astar"
+
+# count planner calls / expanded and pushed nodes / time of every bot (planner.stats), printed after each team
+PROFILE_PLANNERS = False
+
+# per-mission metrics of experienment mode (see metrics.py), None to turn them off
+# e.g. "results/metrics" writes results/metrics_collaboration.csv / .npz and results/metrics_solo.csv / .npz
+METRICS_FILE = None
+
+# replayable missions of experienment mode (seed + action stream, see mission_log.py), None to turn it off
+# e.g. "results/missions" writes results/missions_collaboration.npz and results/missions_solo.npz
+MISSION_LOG = None
 
-def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode):
+# base seed, every mission gets its own seed from it (the kaggle position and the random moves of the bots)
+BASE_SEED = 42
+
+def make_team(team_kind):
+    if team_kind == "collaboration":
+        # Bot A + Bot B
+        return [
+            BotTypeA("P1 (A* main)", grid_rows=GRID_R, grid_cols=GRID_C, planner=PLANNER, obstacles=OBSTACLES, profile=PROFILE_PLANNERS),
+            BotTypeB("P2 (A* supporter)", grid_rows=GRID_R, grid_cols=GRID_C, planner=FOLLOWER_PLANNER, obstacles=OBSTACLES, profile=PROFILE_PLANNERS)
+        ]
+    # let B stay in same palce
+    return [BotTypeA_Solo("P1 (Solo A*)", grid_rows=GRID_R, grid_cols=GRID_C, planner=PLANNER, obstacles=OBSTACLES, profile=PROFILE_PLANNERS), BotTypeA_Solo("P2 (Solo A*)", grid_rows=GRID_R, grid_cols=GRID_C, planner=PLANNER, obstacles=OBSTACLES, profile=PROFILE_PLANNERS)]
+
+def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode, recorder: MissionRecorder = None, mission=None, seed=None, log: MissionLog = None):
     
-    env.reset()
-    for bot in team:
-        bot.reset_agent()
+    if seed is None:
+        if log is not None:
+            raise ValueError("a mission log needs the seed of the mission")
+        env.reset()
+        for bot in team:
+            bot.reset_agent()
+    else:
+        # the env uses the mission seed itself (so the log can replay it), every bot gets its own child seed
+        env.reset(seed=seed)
+        for bot, bot_seed in zip(team, np.random.SeedSequence(seed).spawn(len(team))):
+            bot.reset_agent(seed=bot_seed)
+        if log is not None:
+            log.start(seed)
     
     steps = 0
     mission_complete = False
     hero = None
+    hero_index = -1
+    plan_time = 0.0
+    step_time = 0.0
+    clock = time.perf_counter
+    expanded = sum(bot.planner.expanded for bot in team)
     
     while not mission_complete:
         
@@ -41,6 +101,7 @@ def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode):
         
         for i, bot in enumerate(team):
             
+            t0 = clock()
             action = bot.get_action(
                 my_index=i, 
                 all_robot_positions=all_robot_positions, 
@@ -48,8 +109,13 @@ def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode):
                 grid_rows=GRID_R, 
                 grid_cols=GRID_C
             )
+            t1 = clock()
+            if log is not None:
+                log.record(action)
             
             found_package = env.perform_action(i, action)
+            step_time += clock() - t1
+            plan_time += t1 - t0
             
             if render_mode:
                 info_text = f"[{team_name}] Step: {steps + 1}. {bot.name}: {action.name}"
@@ -57,6 +123,7 @@ def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode):
             
             if found_package:
                 hero = bot.name
+                hero_index = i
                 mission_complete = True
                 break
         
@@ -72,6 +139,19 @@ def run_mission(env: WarehouseRobot, team: list, team_name: str, render_mode):
     if render_mode and steps < MAX_STEPS_PER_MISSION:
         env.render(f"Mission Complete! Found by {hero} in {steps} steps. ({team_name})")
         time.sleep(3)
+
+    if recorder is not None:
+        recorder.add(
+            mission=len(recorder) if mission is None else mission,
+            steps=steps,
+            timeout=steps == MAX_STEPS_PER_MISSION,
+            hero=hero_index,
+            planner_calls=sum(bot.planner_calls for bot in team),
+            nodes_expanded=sum(bot.planner.expanded for bot in team) - expanded,
+            replans=sum(bot.replans for bot in team),
+            plan_time=plan_time,
+            step_time=step_time,
+        )
     
     return steps
 
@@ -87,54 +167,36 @@ def run_experiment():
         print(f"FIND KAGGEL WITH EXPERIENMENT MODE( {MAX_MISSIONS} rounds)")
     print("==================================================")
     
-    # Bot A + Bot B
-    env_collaboration = WarehouseRobot(grid_rows=GRID_R, grid_cols=GRID_C, fps=FPS)
-    team_collaboration = [
-        BotTypeA("P1 (A* main)", grid_rows=GRID_R, grid_cols=GRID_C),
-        BotTypeB("P2 (A* supporter)", grid_rows=GRID_R, grid_cols=GRID_C)
-    ]
+    env_collaboration = WarehouseRobot(grid_rows=GRID_R, grid_cols=GRID_C, fps=FPS, render=render_mode_bool, warehouse_map=WAREHOUSE_MAP)
+    team_collaboration = make_team("collaboration")
     
+    record = METRICS_FILE is not None and not render_mode_bool
+    recorder_collaboration = MissionRecorder() if record else None
+    keep_log = MISSION_LOG is not None and not render_mode_bool
+    log_collaboration = make_log(env_collaboration) if keep_log else None
+
     print(f"\n--- COLLABORATION 1/2 ---")
-    team_1_results = run_trials(env_collaboration, team_collaboration, "Collaboration Team", render_mode=render_mode_bool)
+    if NUM_WORKERS > 0 and not render_mode_bool:
+        team_1_results = run_trials_parallel("collaboration", base_seed=BASE_SEED, num_workers=NUM_WORKERS, recorder=recorder_collaboration, log=log_collaboration)
+    else:
+        team_1_results = run_trials(env_collaboration, team_collaboration, "Collaboration Team", render_mode=render_mode_bool, recorder=recorder_collaboration, log=log_collaboration)
     
     # Render
-    if RENDER_FLAG == 1:
-        pygame.quit() 
+    env_collaboration.close()
 
     # Only Bot A
     
-    env_solo = WarehouseRobot(grid_rows=GRID_R, grid_cols=GRID_C, fps=FPS)
-
-    # Let B stay in same place
-    class BotTypeA_Solo(BotTypeA):
-        def get_action(self, my_index, all_robot_positions, target_pos, grid_rows, grid_cols):
-            
-            if my_index == 1:
-                return RobotAction.DOWN
-            
-            my_pos = all_robot_positions[my_index]
-            
-            # keep original path
-            if self.last_target_pos == target_pos and self.current_path:
-                next_pos = self.current_path.pop(0)
-                return self._pos_to_action(my_pos, next_pos)
-
-            # let Bot B not become a block
-            path = self.planner.find_path(my_pos, target_pos, blocked_pos=None)
-
-            if path and len(path) > 1:
-                self.current_path = path[1:]
-                self.last_target_pos = target_pos
-                next_pos = self.current_path.pop(0)
-                return self._pos_to_action(my_pos, next_pos)
-            else:
-                return random.choice(list(RobotAction))
-
-    # let B stay in same palce
-    team_solo = [BotTypeA_Solo("P1 (Solo A*)", grid_rows=GRID_R, grid_cols=GRID_C), BotTypeA_Solo("P2 (Solo A*)", grid_rows=GRID_R, grid_cols=GRID_C)]
+    env_solo = WarehouseRobot(grid_rows=GRID_R, grid_cols=GRID_C, fps=FPS, render=render_mode_bool, warehouse_map=WAREHOUSE_MAP)
+    team_solo = make_team("solo")
     
+    recorder_solo = MissionRecorder() if record else None
+    log_solo = make_log(env_solo) if keep_log else None
+
     print(f"\n--- SOLO 2/2 ---")
-    team_2_results = run_trials(env_solo, team_solo, "Solo Bot A* (P2 Static)", render_mode=render_mode_bool)
+    if NUM_WORKERS > 0 and not render_mode_bool:
+        team_2_results = run_trials_parallel("solo", base_seed=BASE_SEED, num_workers=NUM_WORKERS, recorder=recorder_solo, log=log_solo)
+    else:
+        team_2_results = run_trials(env_solo, team_solo, "Solo Bot A* (P2 Static)", render_mode=render_mode_bool, recorder=recorder_solo, log=log_solo)
     
     print("\n==================================================")
     if RENDER_FLAG == 0:
@@ -146,26 +208,50 @@ def run_experiment():
         print(f"2. SOLO BOT ({team_solo[0].name} & P2 stop):")
         print(f"   Average Steps: {team_2_results['avg_steps']:.2f}")
         print(f"   Exceed Limit: {team_2_results['timeouts']}")
+        if record:
+            save_metrics(recorder_collaboration, "collaboration")
+            save_metrics(recorder_solo, "solo")
+        if keep_log:
+            save_log(log_collaboration, "collaboration")
+            save_log(log_solo, "solo")
     else:
         print("RENDER MODE END")
     print("==================================================")
     
-    pygame.quit()
+    env_solo.close()
     sys.exit()
     
-def run_trials(env, team, name, render_mode=False):
+def save_metrics(recorder, team_kind):
+    filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{METRICS_FILE}_{team_kind}")
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    recorder.save_csv(filename + ".csv")
+    recorder.save_npz(filename + ".npz")
+    print("--------------------------------------------------")
+    print(f"METRICS {team_kind.upper()} -> {filename}.csv / .npz")
+    print(format_summary(recorder.summary()))
+
+def save_log(log, team_kind):
+    filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{MISSION_LOG}_{team_kind}.npz")
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    log.save(filename)
+    print("--------------------------------------------------")
+    print(f"MISSION LOG {team_kind.upper()} -> {filename} ({len(log)} missions, {len(log.actions)} actions)")
+
+def run_trials(env, team, name, render_mode=False, recorder=None, log=None, base_seed=BASE_SEED):
     total_steps = 0
     timeouts = 0
+    # same mission seeds as run_trials_parallel
+    seeds = mission_seeds(base_seed, MAX_MISSIONS)
     
     if render_mode:
         # render mode
-        steps = run_mission(env, team, name, render_mode=render_mode) 
+        steps = run_mission(env, team, name, render_mode=render_mode, seed=seeds[0]) 
         total_steps = steps
         
     else:
         # experienment mode
         for i in range(MAX_MISSIONS):
-            steps = run_mission(env, team, name, render_mode=render_mode) 
+            steps = run_mission(env, team, name, render_mode=render_mode, recorder=recorder, mission=i, seed=seeds[i], log=log) 
             total_steps += steps
             
             if steps == MAX_STEPS_PER_MISSION:
@@ -178,11 +264,105 @@ def run_trials(env, team, name, render_mode=False):
         final_avg = total_steps / MAX_MISSIONS
         print(f"  > Mission {MAX_MISSIONS}/{MAX_MISSIONS} | Avg Steps: {final_avg:.2f} | Timeouts: {timeouts}")
 
+    planner_stats = team_planner_stats(team)
+    if planner_stats is not None:
+        print(f"  > Planners: {planner_stats}")
 
     return {
         "total_steps": total_steps,
         "avg_steps": total_steps / MAX_MISSIONS if MAX_MISSIONS > 0 else 0,
-        "timeouts": timeouts
+        "timeouts": timeouts,
+        "planner_stats": planner_stats,
+    }
+
+def team_planner_stats(team):
+    # all bots of the team together, None when the planners were built without profile
+    stats = [bot.planner.stats for bot in team if bot.planner.stats is not None]
+    if not stats:
+        return None
+    total = PlannerStats()
+    for bot_stats in stats:
+        total.merge(bot_stats)
+    return total
+
+def mission_seeds(base_seed, num_missions):
+    # one independent seed per mission, so a mission does not depend on which worker runs it
+    children = np.random.SeedSequence(base_seed).spawn(num_missions)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+def make_log(env: WarehouseRobot):
+    return MissionLog(env.grid_rows, env.grid_cols, num_robots=env.num_robots, max_steps=MAX_STEPS_PER_MISSION, warehouse_map=env.warehouse_map)
+
+def _run_shard(team_kind, seeds, first_mission=0, record=False, keep_log=False):
+    # worker: build its own env and team, run every mission with its own seed
+    # returns the steps of every mission, the metric columns (None when record is False), the planner stats
+    # and the mission log (None when keep_log is False)
+    env = WarehouseRobot(grid_rows=GRID_R, grid_cols=GRID_C, fps=FPS, warehouse_map=WAREHOUSE_MAP)
+    team = make_team(team_kind)
+    recorder = MissionRecorder() if record else None
+    log = make_log(env) if keep_log else None
+    steps_list = []
+    for k, seed in enumerate(seeds):
+        steps_list.append(run_mission(env, team, team_kind, render_mode=False, recorder=recorder, mission=first_mission + k, seed=seed, log=log))
+    planner_stats = team_planner_stats(team)
+    return steps_list, recorder.columns if record else None, planner_stats.as_dict() if planner_stats is not None else None, log
+
+def run_trials_parallel(team_kind, base_seed=BASE_SEED, num_workers=NUM_WORKERS, recorder=None, log=None):
+    seeds = mission_seeds(base_seed, MAX_MISSIONS)
+
+    # several shards per worker to keep the pool busy, results are merged by mission index
+    num_shards = max(1, min(MAX_MISSIONS, num_workers * 4))
+    bounds = np.linspace(0, MAX_MISSIONS, num_shards + 1).astype(int)
+    shards = [(bounds[k], bounds[k + 1]) for k in range(num_shards) if bounds[k] < bounds[k + 1]]
+
+    record = recorder is not None
+    keep_log = log is not None
+    mission_steps = [0] * MAX_MISSIONS
+    shard_columns = {}
+    shard_logs = {}
+    shard_stats = []
+    done = 0
+    if num_workers <= 1:
+        for lo, hi in shards:
+            mission_steps[lo:hi], shard_columns[lo], stats, shard_logs[lo] = _run_shard(team_kind, seeds[lo:hi], lo, record, keep_log)
+            shard_stats.append(stats)
+            done += hi - lo
+            print(f"  > Mission {done}/{MAX_MISSIONS}", end='\r')
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            futures = {pool.submit(_run_shard, team_kind, seeds[lo:hi], lo, record, keep_log): (lo, hi) for lo, hi in shards}
+            for future in as_completed(futures):
+                lo, hi = futures[future]
+                mission_steps[lo:hi], shard_columns[lo], stats, shard_logs[lo] = future.result()
+                shard_stats.append(stats)
+                done += hi - lo
+                print(f"  > Mission {done}/{MAX_MISSIONS}", end='\r')
+
+    if record:
+        # in mission order, whichever worker finished first
+        for lo in sorted(shard_columns):
+            recorder.extend(shard_columns[lo])
+    if keep_log:
+        for lo in sorted(shard_logs):
+            log.extend(shard_logs[lo])
+
+    total_steps = sum(mission_steps)
+    timeouts = sum(1 for steps in mission_steps if steps == MAX_STEPS_PER_MISSION)
+    final_avg = total_steps / MAX_MISSIONS if MAX_MISSIONS > 0 else 0
+    print(f"  > Mission {MAX_MISSIONS}/{MAX_MISSIONS} | Avg Steps: {final_avg:.2f} | Timeouts: {timeouts} | Workers: {num_workers}")
+
+    planner_stats = None
+    if any(stats is not None for stats in shard_stats):
+        planner_stats = PlannerStats()
+        for stats in shard_stats:
+            planner_stats.merge(stats)
+        print(f"  > Planners: {planner_stats}")
+
+    return {
+        "total_steps": total_steps,
+        "avg_steps": final_avg,
+        "timeouts": timeouts,
+        "planner_stats": planner_stats,
     }
 
 if __name__ == "__main__":
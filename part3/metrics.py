@@ -0,0 +1,86 @@
+'''
+Per-mission metrics of the warehouse experiment
+每個任務記錄一筆資料 (步數, 找到包裹的機器人, 規劃次數, 展開節點數, 重新規劃次數, 規劃 / 移動花的時間)
+資料以欄位 (column) 方式存放, 可以存成 CSV 或 NumPy .npz, 並算出百分位數摘要
+'''
+import numpy as np
+import csv
+
+# column name -> dtype
+MISSION_FIELDS = {
+    "mission": np.int64,
+    "steps": np.int64,
+    "timeout": np.bool_,
+    "hero": np.int64,           # index of the bot that found the kaggle, -1 for a timeout
+    "planner_calls": np.int64,
+    "nodes_expanded": np.int64,
+    "replans": np.int64,        # planner calls made after the first plan of the mission
+    "plan_time": np.float64,    # seconds spent in get_action
+    "step_time": np.float64,    # seconds spent in perform_action
+}
+
+class MissionRecorder:
+    def __init__(self):
+        self.columns = {field: [] for field in MISSION_FIELDS}
+
+    def __len__(self):
+        return len(self.columns["mission"])
+
+    def add(self, **record):
+        if record.keys() != MISSION_FIELDS.keys():
+            raise ValueError(f"mission record needs the fields {list(MISSION_FIELDS)}, got {list(record)}")
+        for field, value in record.items():
+            self.columns[field].append(value)
+
+    def extend(self, columns):
+        # columns of another recorder (e.g. from a worker process)
+        for field in MISSION_FIELDS:
+            self.columns[field].extend(columns[field])
+
+    def to_arrays(self):
+        return {field: np.asarray(values, dtype=MISSION_FIELDS[field]) for field, values in self.columns.items()}
+
+    def save_npz(self, filename):
+        np.savez(filename, **self.to_arrays())
+
+    def save_csv(self, filename):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(MISSION_FIELDS)
+            writer.writerows(zip(*self.columns.values()))
+
+    @classmethod
+    def load_npz(cls, filename):
+        recorder = cls()
+        with np.load(filename) as data:
+            recorder.extend({field: data[field].tolist() for field in MISSION_FIELDS})
+        return recorder
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        mean and percentiles of every numeric column, plus totals of the time columns
+        """
+        arrays = self.to_arrays()
+        result = {"missions": len(self), "timeouts": int(arrays["timeout"].sum())}
+        if len(self) == 0:
+            return result
+        for field in ("steps", "planner_calls", "nodes_expanded", "replans", "plan_time", "step_time"):
+            values = arrays[field]
+            result[field] = {"mean": float(values.mean()), **{f"p{p}": float(np.percentile(values, p)) for p in percentiles}}
+        result["total_plan_time"] = float(arrays["plan_time"].sum())
+        result["total_step_time"] = float(arrays["step_time"].sum())
+        return result
+
+def format_summary(summary):
+    lines = [f"   Missions: {summary['missions']}  Timeouts: {summary['timeouts']}"]
+    for field in ("steps", "planner_calls", "nodes_expanded", "replans"):
+        if field in summary:
+            stats = summary[field]
+            lines.append(f"   {field:<15}" + "  ".join(f"{name} {value:.1f}" for name, value in stats.items()))
+    for field in ("plan_time", "step_time"):
+        if field in summary:
+            stats = summary[field]
+            lines.append(f"   {field + ' (ms)':<15}" + "  ".join(f"{name} {1000 * value:.3f}" for name, value in stats.items()))
+    if "total_plan_time" in summary:
+        lines.append(f"   Total planning {summary['total_plan_time']:.2f}s, stepping {summary['total_step_time']:.2f}s")
+    return "\n".join(lines)
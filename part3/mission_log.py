@@ -0,0 +1,104 @@
+'''
+Mission log - replayable missions of the warehouse experiment
+每個任務只記錄 seed 和所有機器人依序做的動作 (每個動作 1 byte)
+環境用同一個 seed reset 後會放出同一個包裹, 再依序套用動作就能重現整個任務,
+重播不需要 agent 和路徑規劃, 也不需要 pygame, 所以可以全速跑完
+
+python mission_log.py results/missions_collaboration.npz
+'''
+from warehouse_robot import WarehouseRobot, RobotAction
+from warehouse_map import WarehouseMap
+from array import array
+import numpy as np
+import sys
+
+ACTIONS = list(RobotAction)
+
+class MissionLog:
+    def __init__(self, grid_rows, grid_cols, num_robots=2, max_steps=None, warehouse_map=None):
+        # everything needed to rebuild the same WarehouseRobot for the replay
+        self.grid_rows = grid_rows
+        self.grid_cols = grid_cols
+        self.num_robots = num_robots
+        self.max_steps = max_steps
+        self.warehouse_map = warehouse_map
+        self.seeds = []
+        self.starts = []            # offset of the first action of every mission
+        self.actions = array("b")
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def start(self, seed):
+        self.seeds.append(int(seed))
+        self.starts.append(len(self.actions))
+
+    def record(self, action: RobotAction):
+        self.actions.append(action.value)
+
+    def mission_actions(self, k):
+        end = self.starts[k + 1] if k + 1 < len(self.starts) else len(self.actions)
+        return self.actions[self.starts[k]:end]
+
+    def extend(self, other):
+        # missions of another log (e.g. from a worker process), in order
+        offset = len(self.actions)
+        self.seeds.extend(other.seeds)
+        self.starts.extend(start + offset for start in other.starts)
+        self.actions.extend(other.actions)
+
+    def make_env(self):
+        return WarehouseRobot(grid_rows=self.grid_rows, grid_cols=self.grid_cols, warehouse_map=self.warehouse_map, num_robots=self.num_robots)
+
+    def save(self, filename):
+        np.savez(
+            filename,
+            grid=np.array([self.grid_rows, self.grid_cols, self.num_robots, -1 if self.max_steps is None else self.max_steps], dtype=np.int64),
+            map=np.array(self.warehouse_map.to_lines() if self.warehouse_map is not None else [], dtype=str),
+            seeds=np.array(self.seeds, dtype=np.uint64),
+            starts=np.array(self.starts, dtype=np.int64),
+            actions=np.frombuffer(self.actions, dtype=np.int8),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            grid_rows, grid_cols, num_robots, max_steps = (int(value) for value in data["grid"])
+            lines = data["map"].tolist()
+            log = cls(grid_rows, grid_cols, num_robots=num_robots, max_steps=None if max_steps < 0 else max_steps,
+                      warehouse_map=WarehouseMap(lines) if lines else None)
+            log.seeds = data["seeds"].tolist()
+            log.starts = data["starts"].tolist()
+            log.actions = array("b", data["actions"].tobytes())
+        return log
+
+    def replay(self, env=None):
+        """
+        replay every mission, returns the (steps, hero index) of each mission (hero -1 for a timeout)
+        """
+        if env is None:
+            env = self.make_env()
+        return [replay_mission(env, seed, self.mission_actions(k), self.num_robots, self.max_steps) for k, seed in enumerate(self.seeds)]
+
+def replay_mission(env: WarehouseRobot, seed, actions, num_robots, max_steps=None):
+    env.reset(seed=seed)
+    for k, action in enumerate(actions):
+        if env.perform_action(k % num_robots, ACTIONS[action]):
+            # like main.run_mission: found in the round after the last allowed one still counts as the limit
+            steps = k // num_robots + 1
+            return (steps if max_steps is None else min(steps, max_steps)), k % num_robots
+    steps = -(-len(actions) // num_robots)
+    return (steps if max_steps is None else min(steps, max_steps)), -1
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python mission_log.py <mission log .npz>")
+        sys.exit(1)
+    log = MissionLog.load(sys.argv[1])
+    results = log.replay()
+    steps = [mission_steps for mission_steps, _ in results]
+    # counted like main.py: a mission that used all the steps is over the limit
+    timeouts = sum(1 for mission_steps in steps if mission_steps == log.max_steps)
+    print(f"MAP {log.grid_rows}*{log.grid_cols}, {len(log)} missions, {len(log.actions)} actions")
+    print(f"   Average Steps: {sum(steps) / max(1, len(steps)):.2f}")
+    print(f"   Exceed Limit: {timeouts}")
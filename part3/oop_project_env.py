@@ -6,58 +6,77 @@ import gymnasium as gym
 from gymnasium import spaces
 from gymnasium.envs.registration import register
 from gymnasium.utils.env_checker import check_env
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
 
 import warehouse_robot  as wr
+import vector_warehouse as vw
 import numpy as np
 
 # Register this module as a gym environment. Once registered, the id is usable in gym.make().
+# vector_entry_point lets gym.make_vec() build the array based version instead of copying the env num_envs times.
 register(
     id='warehouse-robot-v0',                                # call it whatever you want
     entry_point='oop_project_env:WarehouseRobotEnv', # module_name:class_name
+    vector_entry_point='oop_project_env:WarehouseRobotVectorEnv',
 )
 
+def _make_spaces(grid_rows, grid_cols, num_agents):
+    # Single agent: Discrete(4). Multi agent: one action per robot, robots move in index order.
+    if num_agents == 1:
+        action_space = spaces.Discrete(len(wr.RobotAction))
+    else:
+        action_space = spaces.MultiDiscrete([len(wr.RobotAction)] * num_agents)
+
+    # Use a 1D vector: [robot_0_row, robot_0_col, ..., robot_N_row, robot_N_col, target_row_pos, target_col_pos]
+    high = np.array([grid_rows-1, grid_cols-1] * (num_agents + 1), dtype=np.int32)
+    observation_space = spaces.Box(low=0, high=high, shape=(2 * (num_agents + 1),), dtype=np.int32)
+    return action_space, observation_space
+
 # Implement our own gym env, must inherit from gym.Env
 # https://gymnasium.farama.org/api/env/
 class WarehouseRobotEnv(gym.Env):
     # metadata is a required attribute
-    # render_modes in our environment is either None or 'human'.
-    # render_fps is not used in our env, but we are require to declare a non-zero value.
-    metadata = {"render_modes": ["human"], 'render_fps': 4}
+    # render_modes in our environment is None, 'human' (pygame window) or 'rgb_array' (offscreen frames,
+    # e.g. for gymnasium.wrappers.RecordVideo on a machine without a display).
+    # render_fps is the speed of the window and of recorded videos.
+    metadata = {"render_modes": ["human", "rgb_array"], 'render_fps': 4}
 
-    def __init__(self, grid_rows=4, grid_cols=5, render_mode=None):
+    def __init__(self, grid_rows=4, grid_cols=5, render_mode=None, num_agents=1):
 
         self.grid_rows=grid_rows
         self.grid_cols=grid_cols
         self.render_mode = render_mode
+        self.num_agents = num_agents
 
-        # Initialize the WarehouseRobot problem
-        self.warehouse_robot = wr.WarehouseRobot(grid_rows=grid_rows, grid_cols=grid_cols, fps=self.metadata['render_fps'])
+        # Initialize the WarehouseRobot problem. The simulation core does not load pygame,
+        # the window is only created the first time render() is called.
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"render_mode must be None or one of {self.metadata['render_modes']}, got {render_mode!r}")
+        self.warehouse_robot = wr.WarehouseRobot(grid_rows=grid_rows, grid_cols=grid_cols, fps=self.metadata['render_fps'], num_robots=num_agents,
+                                                 render_mode=render_mode or "human")
 
         # Gym requires defining the action space. The action space is robot's set of possible actions.
-        # Training code can call action_space.sample() to randomly select an action. 
-        self.action_space = spaces.Discrete(len(wr.RobotAction))
-
+        # Training code can call action_space.sample() to randomly select an action.
         # Gym requires defining the observation space. The observation space consists of the robot's and target's set of possible positions.
         # The observation space is used to validate the observation returned by reset() and step().
-        # Use a 1D vector: [robot_row_pos, robot_col_pos, target_row_pos, target_col_pos]
-        self.observation_space = spaces.Box(
-            low=0,
-            high=np.array([self.grid_rows-1, self.grid_cols-1, self.grid_rows-1, self.grid_cols-1]),
-            shape=(4,),
-            dtype=np.int32
-        )
+        self.action_space, self.observation_space = _make_spaces(grid_rows, grid_cols, num_agents)
+
+    def _get_obs(self):
+        # [robot_row_pos, robot_col_pos, ..., target_row_pos, target_col_pos]
+        return np.array(sum(self.warehouse_robot.robot_positions, []) + self.warehouse_robot.target_pos, dtype=np.int32)
 
     # Gym required function (and parameters) to reset the environment
     def reset(self, seed=None, options=None):
         super().reset(seed=seed) # gym requires this call to control randomness and reproduce scenarios.
 
-        # Reset the WarehouseRobot. Optionally, pass in seed control randomness and reproduce scenarios.
-        self.warehouse_robot.reset(seed=seed)
+        # Reset the WarehouseRobot. The target is drawn with the env's own random generator
+        # so that reset(seed=...) reproduces scenarios.
+        self.warehouse_robot.rng = self.np_random
+        self.warehouse_robot.reset()
+
+        obs = self._get_obs()
 
-        # Construct the observation state:
-        # [robot_row_pos, robot_col_pos, target_row_pos, target_col_pos]
-        obs = np.concatenate((self.warehouse_robot.robot_pos, self.warehouse_robot.target_pos))
-        
         # Additional info to return. For debugging or whatever.
         info = {}
 
@@ -70,8 +89,16 @@ class WarehouseRobotEnv(gym.Env):
 
     # Gym required function (and parameters) to perform an action
     def step(self, action):
-        # Perform action
-        target_reached = self.warehouse_robot.perform_action(wr.RobotAction(action))
+        actions = [action] if self.num_agents == 1 else list(action)
+
+        # Perform action, robots move one after another until one of them reaches the target
+        target_reached = False
+        hero = None
+        for i, robot_action in enumerate(actions):
+            if self.warehouse_robot.perform_action(i, wr.RobotAction(int(robot_action))):
+                target_reached = True
+                hero = i
+                break
 
         # Determine reward and termination
         reward=0
@@ -80,16 +107,14 @@ class WarehouseRobotEnv(gym.Env):
             reward=1
             terminated=True
 
-        # Construct the observation state: 
-        # [robot_row_pos, robot_col_pos, target_row_pos, target_col_pos]
-        obs = np.concatenate((self.warehouse_robot.robot_pos, self.warehouse_robot.target_pos))
+        obs = self._get_obs()
 
         # Additional info to return. For debugging or whatever.
-        info = {}
+        info = {} if hero is None else {"hero": hero}
 
         # Render environment
         if(self.render_mode=='human'):
-            print(wr.RobotAction(action))
+            print([wr.RobotAction(int(a)) for a in actions])
             self.render()
 
         # Return observation, reward, terminated, truncated (not used), info
@@ -97,7 +122,73 @@ class WarehouseRobotEnv(gym.Env):
 
     # Gym required function to render environment
     def render(self):
-        self.warehouse_robot.render()
+        if self.render_mode is None:
+            return
+        # rgb_array: (height, width, 3) uint8 frame
+        return self.warehouse_robot.render()
+
+    def close(self):
+        self.warehouse_robot.close()
+
+# Array based vector env (like CartPoleVectorEnv): every copy lives in the arrays of VectorWarehouseRobot,
+# so one step() moves all robots of all copies with a few NumPy operations.
+class WarehouseRobotVectorEnv(VectorEnv):
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs=1, grid_rows=4, grid_cols=5, num_agents=1, max_episode_steps=None, render_mode=None):
+        self.num_envs = num_envs
+        self.grid_rows = grid_rows
+        self.grid_cols = grid_cols
+        self.num_agents = num_agents
+        self.max_episode_steps = max_episode_steps
+        # the copies are not drawn, use gym.make_vec(..., vectorization_mode="sync") to render them
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"render_mode must be None or one of {self.metadata['render_modes']}, got {render_mode!r}")
+        self.render_mode = render_mode
+
+        self.single_action_space, self.single_observation_space = _make_spaces(grid_rows, grid_cols, num_agents)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        # max_steps of the core is not used, truncation is handled here
+        self.core = vw.VectorWarehouseRobot(num_envs, grid_rows=grid_rows, grid_cols=grid_cols, num_robots=num_agents, max_steps=np.iinfo(np.int32).max)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.prev_done = np.zeros(num_envs, dtype=np.bool_)
+
+    def _get_obs(self):
+        robots = self.core.robot_positions.reshape(self.num_envs, -1)
+        return np.concatenate((robots, self.core.target_pos), axis=1).astype(np.int32)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        self.core.rng = self.np_random
+        self.core.reset()
+        self.steps = np.zeros(self.num_envs, dtype=np.int32)
+        self.prev_done = np.zeros(self.num_envs, dtype=np.bool_)
+        return self._get_obs(), {}
+
+    def step(self, action):
+        actions = np.asarray(action).reshape(self.num_envs, self.num_agents)
+
+        # Reset the copies which terminated or were truncated in the last step, they ignore this action
+        if self.prev_done.any():
+            self.core.reset(mask=self.prev_done)
+            self.steps[self.prev_done] = 0
+
+        active = ~self.prev_done
+        terminated = np.zeros(self.num_envs, dtype=np.bool_)
+        for i in range(self.num_agents):
+            terminated |= self.core.perform_actions(i, actions[:, i], active=active & ~terminated)
+
+        self.steps[active] += 1
+        if self.max_episode_steps is not None:
+            truncated = active & ~terminated & (self.steps >= self.max_episode_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=np.bool_)
+        reward = terminated.astype(np.float32)
+
+        self.prev_done = terminated | truncated
+        return self._get_obs(), reward, terminated, truncated, {}
 
 # For unit testing
 if __name__=="__main__":
@@ -108,6 +199,14 @@ if __name__=="__main__":
     # check_env(env.unwrapped)
     # print("Check environment end")
 
+    # Vector version: all copies are stepped with array operations
+    # envs = gym.make_vec('warehouse-robot-v0', num_envs=1024)
+
+    # Headless video (needs moviepy): rgb_array renders offscreen, no display required
+    # env = gym.wrappers.RecordVideo(gym.make('warehouse-robot-v0', render_mode='rgb_array'), "videos")
+    # from gymnasium.utils.performance import benchmark_render
+    # print(benchmark_render(gym.make('warehouse-robot-v0', render_mode='rgb_array').unwrapped))
+
     # Reset environment
     obs = env.reset()[0]
 
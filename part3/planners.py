@@ -0,0 +1,857 @@
+from collections import OrderedDict, deque
+from functools import partial
+from array import array
+from warehouse_robot import RobotAction
+import numpy as np
+import heapq
+import time
+
+def build_neighbor_table(grid_rows, grid_cols, obstacles=None):
+    """
+    neighbors of every flat cell id (r * cols + c) in UP, DOWN, LEFT, RIGHT order,
+    cells blocked in the static obstacle array are left out
+    """
+    table = []
+    for r in range(grid_rows):
+        for c in range(grid_cols):
+            cells = []
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < grid_rows and 0 <= nc < grid_cols:
+                    if obstacles is not None and obstacles[nr, nc]:
+                        continue
+                    cells.append(nr * grid_cols + nc)
+            table.append(tuple(cells))
+    return table
+
+class PlannerStats:
+    """
+    profiling counters of a planner built with profile=True (planner.stats, None otherwise)
+    the planners always keep running totals of expanded / pushed nodes (updated once per search),
+    measure() only takes the difference around a call, so a planner without stats pays nothing extra
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.paths_found = 0
+        self.nodes_expanded = 0
+        self.nodes_pushed = 0
+        self.max_open = 0       # largest open list / queue left at the end of a search
+        self.time = 0.0         # seconds spent in find_path
+
+    def measure(self, planner, search, *args):
+        expanded = planner.expanded
+        pushed = planner.pushed
+        start = time.perf_counter()
+        result = search(*args)
+        self.time += time.perf_counter() - start
+        self.calls += 1
+        if result is not None:
+            self.paths_found += 1
+        self.nodes_expanded += planner.expanded - expanded
+        self.nodes_pushed += planner.pushed - pushed
+        self.max_open = max(self.max_open, planner.open_size)
+        return result
+
+    def merge(self, other):
+        # other: PlannerStats or its as_dict()
+        if isinstance(other, PlannerStats):
+            other = other.as_dict()
+        self.calls += other["calls"]
+        self.paths_found += other["paths_found"]
+        self.nodes_expanded += other["nodes_expanded"]
+        self.nodes_pushed += other["nodes_pushed"]
+        self.max_open = max(self.max_open, other["max_open"])
+        self.time += other["time"]
+        return self
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "paths_found": self.paths_found,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_pushed": self.nodes_pushed,
+            "max_open": self.max_open,
+            "time": self.time,
+        }
+
+    def __str__(self):
+        per_call = self.nodes_expanded / self.calls if self.calls else 0
+        ms_per_call = 1000 * self.time / self.calls if self.calls else 0
+        return (f"calls {self.calls} (found {self.paths_found}), expanded {self.nodes_expanded} ({per_call:.1f}/call), "
+                f"pushed {self.nodes_pushed}, max open {self.max_open}, {ms_per_call:.3f} ms/call")
+
+# search strategies of AStarPlanner
+# astar:         A* with the Manhattan heuristic
+# weighted:      A* with f = g + weight * h, expands fewer nodes but the path can be longer
+# jps:           Jump Point Search for 4-connected grids, only jump points go into the open list
+# bidirectional: breadth-first search from both ends until the two frontiers meet
+# all but weighted return shortest paths (ties may be broken differently from astar)
+SEARCH_STRATEGIES = ("astar", "weighted", "jps", "bidirectional")
+
+class AStarPlanner:
+    def __init__(self, grid_rows, grid_cols, obstacles=None, profile=False, strategy="astar", weight=2):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"unknown search strategy {strategy!r}, expected one of {SEARCH_STRATEGIES}")
+        self.rows = grid_rows
+        self.cols = grid_cols
+        # static obstacle array shared with the environment (not copied)
+        self.obstacles = obstacles
+        self.strategy = strategy
+        self.weight = weight if strategy == "weighted" else 1
+
+        # running totals, profile=True also times every call (PlannerStats)
+        self.expanded = 0
+        self.pushed = 0
+        self.open_size = 0
+        self.stats = PlannerStats() if profile else None
+
+        self._search = {
+            "astar": self._find_path,
+            "weighted": self._find_path,
+            "jps": self._find_path_jps,
+            "bidirectional": self._find_path_bidirectional,
+        }[strategy]
+        if strategy == "jps":
+            self._build_jump_tables()
+        if strategy == "bidirectional":
+            self._neighbors = build_neighbor_table(grid_rows, grid_cols, obstacles)
+
+    def heuristic(self, pos1, pos2):
+        # Manhattan distance
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    def find_path(self, start_pos, goal_pos, blocked_pos=None):
+        if self.stats is None:
+            return self._search(start_pos, goal_pos, blocked_pos)
+        return self.stats.measure(self, self._search, start_pos, goal_pos, blocked_pos)
+
+    def _count(self, expanded, priority_queue):
+        # every node pushed was either popped (expanded) or is still in the queue
+        self.expanded += expanded
+        self.pushed += expanded + len(priority_queue)
+        self.open_size = len(priority_queue)
+
+    def _find_path(self, start_pos, goal_pos, blocked_pos=None):
+
+        if start_pos == goal_pos:
+            return None
+
+        priority_queue = [(0, 0, start_pos[0], start_pos[1])]
+        g_cost = {tuple(start_pos): 0}
+        came_from = {}
+        expanded = 0
+        
+        blocked_tuple = tuple(blocked_pos) if blocked_pos else None
+        obstacles = self.obstacles
+        weight = self.weight
+        
+        while priority_queue:
+            f_cost, g_current, r, c = heapq.heappop(priority_queue)
+            current_pos = (r, c)
+            expanded += 1
+
+            if list(current_pos) == goal_pos:
+                self._count(expanded, priority_queue)
+                # rebuilt path
+                path = []
+                while current_pos in came_from:
+                    path.append(list(current_pos))
+                    current_pos = came_from[current_pos]
+                path.append(list(start_pos))
+                return path[::-1] 
+
+            # go through 4 neighbor
+            for dr, dc, action in [(-1, 0, RobotAction.UP), (1, 0, RobotAction.DOWN), (0, -1, RobotAction.LEFT), (0, 1, RobotAction.RIGHT)]:
+                neighbor_r, neighbor_c = r + dr, c + dc
+                neighbor_pos = (neighbor_r, neighbor_c)
+
+                if 0 <= neighbor_r < self.rows and 0 <= neighbor_c < self.cols:
+                    # avoid collapse
+                    if blocked_tuple and neighbor_pos == blocked_tuple:
+                        continue 
+                    # shelves and walls
+                    if obstacles is not None and obstacles[neighbor_r, neighbor_c]:
+                        continue
+                        
+                    new_g_cost = g_current + 1 
+
+                    if new_g_cost < g_cost.get(neighbor_pos, float('inf')):
+                        g_cost[neighbor_pos] = new_g_cost
+                        f_cost = new_g_cost + weight * self.heuristic(list(neighbor_pos), goal_pos)
+                        heapq.heappush(priority_queue, (f_cost, new_g_cost, neighbor_r, neighbor_c))
+                        came_from[neighbor_pos] = current_pos
+        
+        self._count(expanded, priority_queue)
+        return None
+
+    def _build_jump_tables(self):
+        """
+        vertical jumps only depend on the shelves and walls (plus the goal and the blocked cell, checked per call),
+        so for every cell and direction (-1 up, 1 down) precompute
+        _jump_end[d][cell]:  last open row before a shelf / wall / the edge (the row of the cell if it cannot move)
+        _jump_stop[d][cell]: first row with a forced turn before that, -1 for none
+        """
+        rows, cols = self.rows, self.cols
+        obstacles = self.obstacles
+        # 1 for cells that are not a shelf or wall
+        self._free = free = bytearray(1 if obstacles is None or not obstacles[cell // cols, cell % cols] else 0
+                                      for cell in range(rows * cols))
+
+        def is_free(r, c):
+            return 0 <= r < rows and 0 <= c < cols and free[r * cols + c]
+
+        self._jump_end = {}
+        self._jump_stop = {}
+        for d in (-1, 1):
+            end = array('i', [0]) * (rows * cols)
+            stop = array('i', [-1]) * (rows * cols)
+            for c in range(cols):
+                # walk against the jump direction so the next cell is already done
+                for r in (range(rows - 1, -1, -1) if d == 1 else range(rows)):
+                    cell = r * cols + c
+                    nr = r + d
+                    if not is_free(nr, c):
+                        end[cell] = r
+                        continue
+                    next_cell = nr * cols + c
+                    end[cell] = end[next_cell]
+                    forced = any(is_free(nr, c + s) and not is_free(r, c + s) for s in (-1, 1))
+                    stop[cell] = nr if forced else stop[next_cell]
+            self._jump_end[d] = end
+            self._jump_stop[d] = stop
+
+    def _find_path_jps(self, start_pos, goal_pos, blocked_pos=None):
+        """
+        Jump Point Search on a 4-connected grid.
+        Among the shortest paths only the ones that move horizontally first are searched:
+        a vertical move turns horizontal only where it is forced (the cell beside it is open but the cell
+        diagonally behind is not), a horizontal move may turn vertical anywhere.
+        So a vertical jump runs until a forced turn, and a horizontal jump runs until one of its vertical
+        jumps finds something. A* runs over (jump point, direction of arrival) and the path between two
+        jump points is a straight line.
+        """
+        if start_pos == goal_pos:
+            return None
+
+        rows, cols = self.rows, self.cols
+        free = self._free
+        blocked = blocked_pos[0] * cols + blocked_pos[1] if blocked_pos else -1
+        blocked_r, blocked_c = (blocked_pos[0], blocked_pos[1]) if blocked_pos else (-2, -2)
+        goal_r, goal_c = goal_pos[0], goal_pos[1]
+        if goal_r * cols + goal_c == blocked:
+            self._count(0, [])
+            return None
+        jump_end = self._jump_end
+        jump_stop = self._jump_stop
+
+        def is_open(r, c):
+            if 0 <= r < rows and 0 <= c < cols:
+                cell = r * cols + c
+                return free[cell] and cell != blocked
+            return False
+
+        def jump_vertical(r, c, dr):
+            # the first of: static forced turn, goal, turn forced by the blocked cell; nothing past the blocked cell or a shelf
+            cell = r * cols + c
+            stop = jump_stop[dr][cell]
+            limit = (jump_end[dr][cell] - r) * dr if stop == -1 else (stop - r) * dr
+            if c == blocked_c and 0 < (blocked_r - r) * dr <= limit:
+                limit = (blocked_r - r) * dr - 1
+                stop = -1
+            best = (stop - r) * dr if stop != -1 else limit + 1
+            if c == goal_c and 0 < (goal_r - r) * dr <= limit and (goal_r - r) * dr <= best:
+                return goal_r, c
+            if blocked_c - c in (-1, 1) and 0 < (blocked_r + dr - r) * dr <= limit and (blocked_r + dr - r) * dr < best and is_open(blocked_r + dr, blocked_c):
+                return blocked_r + dr, c
+            if best <= limit:
+                return r + best * dr, c
+            return None
+
+        def jump_horizontal(r, c, dc):
+            while True:
+                c += dc
+                if not is_open(r, c):
+                    return None
+                if (r == goal_r and c == goal_c) or jump_vertical(r, c, -1) or jump_vertical(r, c, 1):
+                    return r, c
+
+        # node: (r, c, axis), axis 0 = start, 1 = reached moving horizontally, 2 = reached moving vertically
+        start = (start_pos[0], start_pos[1], 0)
+        priority_queue = [(0, 0, start)]
+        g_cost = {start: 0}
+        came_from = {}
+        expanded = 0
+
+        stale = 0
+
+        while priority_queue:
+            f_cost, g_current, node = heapq.heappop(priority_queue)
+            if g_current > g_cost[node]:
+                stale += 1
+                continue
+            expanded += 1
+            r, c, axis = node
+
+            if r == goal_r and c == goal_c:
+                self._count(expanded, priority_queue)
+                self.pushed += stale
+                # rebuilt path, filling in the straight lines between jump points
+                path = [[r, c]]
+                while node in came_from:
+                    parent = came_from[node]
+                    pr, pc = parent[0], parent[1]
+                    step_r = (pr > r) - (pr < r)
+                    step_c = (pc > c) - (pc < c)
+                    while (r, c) != (pr, pc):
+                        r += step_r
+                        c += step_c
+                        path.append([r, c])
+                    node = parent
+                return path[::-1]
+
+            # successors after pruning, by the direction the node was reached from
+            if axis == 0:
+                jumps = [(jump_vertical(r, c, -1), 2), (jump_vertical(r, c, 1), 2), (jump_horizontal(r, c, -1), 1), (jump_horizontal(r, c, 1), 1)]
+            else:
+                parent = came_from[node]
+                if axis == 1:
+                    dc = 1 if c > parent[1] else -1
+                    jumps = [(jump_vertical(r, c, -1), 2), (jump_vertical(r, c, 1), 2), (jump_horizontal(r, c, dc), 1)]
+                else:
+                    dr = 1 if r > parent[0] else -1
+                    jumps = [(jump_vertical(r, c, dr), 2)]
+                    for dc in (-1, 1):
+                        if is_open(r, c + dc) and not is_open(r - dr, c + dc):
+                            jumps.append(((r, c + dc), 1))
+
+            for jump, new_axis in jumps:
+                if jump is None:
+                    continue
+                neighbor = (jump[0], jump[1], new_axis)
+                new_g_cost = g_current + abs(jump[0] - r) + abs(jump[1] - c)
+                if new_g_cost < g_cost.get(neighbor, float('inf')):
+                    g_cost[neighbor] = new_g_cost
+                    came_from[neighbor] = node
+                    heapq.heappush(priority_queue, (new_g_cost + abs(jump[0] - goal_r) + abs(jump[1] - goal_c), new_g_cost, neighbor))
+
+        self._count(expanded, priority_queue)
+        self.pushed += stale
+        return None
+
+    def _find_path_bidirectional(self, start_pos, goal_pos, blocked_pos=None):
+        """
+        breadth-first search from the start and from the goal, one whole level of the smaller frontier at a time;
+        when the frontiers touch, the best meeting cell of that level gives a shortest path
+        """
+        if start_pos == goal_pos:
+            return None
+
+        cols = self.cols
+        neighbors = self._neighbors
+        start = start_pos[0] * cols + start_pos[1]
+        goal = goal_pos[0] * cols + goal_pos[1]
+        blocked = blocked_pos[0] * cols + blocked_pos[1] if blocked_pos else -1
+        if goal == blocked or (self.obstacles is not None and self.obstacles[goal_pos[0], goal_pos[1]]):
+            self._count(0, [])
+            return None
+
+        # cell -> (parent, depth) for each side
+        forward = {start: (-1, 0)}
+        backward = {goal: (-1, 0)}
+        forward_frontier = [start]
+        backward_frontier = [goal]
+        expanded = 0
+        meeting = None
+
+        while forward_frontier and backward_frontier and meeting is None:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, visited, other = forward_frontier, forward, backward
+            else:
+                frontier, visited, other = backward_frontier, backward, forward
+
+            best = None
+            next_frontier = []
+            for cell in frontier:
+                expanded += 1
+                depth = visited[cell][1] + 1
+                for n in neighbors[cell]:
+                    if n == blocked or n in visited:
+                        continue
+                    visited[n] = (cell, depth)
+                    next_frontier.append(n)
+                    if n in other:
+                        length = depth + other[n][1]
+                        if best is None or length < best[0]:
+                            best = (length, n)
+            if best is not None:
+                meeting = best[1]
+            if visited is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        self._count(expanded, forward_frontier + backward_frontier)
+        if meeting is None:
+            return None
+
+        # rebuilt path: start ... meeting from the forward side, then meeting ... goal from the backward side
+        path = []
+        cell = meeting
+        while cell != -1:
+            path.append([cell // cols, cell % cols])
+            cell = forward[cell][0]
+        path.reverse()
+        cell = backward[meeting][0]
+        while cell != -1:
+            path.append([cell // cols, cell % cols])
+            cell = backward[cell][0]
+        return path
+
+class DistanceFieldPlanner:
+    """
+    BFS distance field planner.
+    For each (goal, blocked cell) pair one BFS from the goal gives the distance of every cell
+    and the next hop towards the goal, so choosing a move is a table lookup.
+    Fields are built lazily and kept in an LRU cache.
+    """
+    def __init__(self, grid_rows, grid_cols, obstacles=None, cache_size=256, profile=False):
+        self.rows = grid_rows
+        self.cols = grid_cols
+        self.obstacles = obstacles
+        self.cache_size = cache_size
+        self._fields = OrderedDict()
+
+        # running totals of the BFS runs (cache hits expand nothing), see PlannerStats
+        self.expanded = 0
+        self.pushed = 0
+        self.open_size = 0
+        self.stats = PlannerStats() if profile else None
+
+        # neighbor table by flat cell id (r * cols + c), same order as AStarPlanner
+        self._neighbors = build_neighbor_table(self.rows, self.cols, obstacles)
+
+    def heuristic(self, pos1, pos2):
+        # Manhattan distance
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    def distance_field(self, goal_pos, blocked_pos=None):
+        """
+        return (dist, next_hop) as flat arrays, -1 means unreachable
+        """
+        key = (goal_pos[0], goal_pos[1], tuple(blocked_pos) if blocked_pos else None)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            return field
+
+        field = self._build_field(goal_pos, blocked_pos)
+        self._fields[key] = field
+        if len(self._fields) > self.cache_size:
+            self._fields.popitem(last=False)
+        return field
+
+    def _build_field(self, goal_pos, blocked_pos):
+        size = self.rows * self.cols
+        dist = array('i', [-1]) * size
+        next_hop = array('i', [-1]) * size
+
+        goal = goal_pos[0] * self.cols + goal_pos[1]
+        blocked = blocked_pos[0] * self.cols + blocked_pos[1] if blocked_pos else -1
+
+        # a blocked goal can never be reached (same as AStarPlanner)
+        if goal == blocked or (self.obstacles is not None and self.obstacles[goal_pos[0], goal_pos[1]]):
+            return dist, next_hop
+
+        dist[goal] = 0
+        queue = deque([goal])
+        neighbors = self._neighbors
+        expanded = 0
+        while queue:
+            cell = queue.popleft()
+            expanded += 1
+            d = dist[cell] + 1
+            for n in neighbors[cell]:
+                if dist[n] == -1:
+                    dist[n] = d
+                    next_hop[n] = cell
+                    # the blocked cell gets a distance (a robot standing there can leave it), but no path goes through it
+                    if n != blocked:
+                        queue.append(n)
+        self.expanded += expanded
+        self.pushed += expanded
+        self.open_size = 0
+        return dist, next_hop
+
+    def next_step(self, start_pos, goal_pos, blocked_pos=None):
+        """
+        O(1) move selection: the next cell on a shortest path, or None
+        """
+        if self.stats is None:
+            return self._next_step(start_pos, goal_pos, blocked_pos)
+        return self.stats.measure(self, self._next_step, start_pos, goal_pos, blocked_pos)
+
+    def _next_step(self, start_pos, goal_pos, blocked_pos=None):
+        if start_pos == goal_pos:
+            return None
+        dist, next_hop = self.distance_field(goal_pos, blocked_pos)
+        cell = next_hop[start_pos[0] * self.cols + start_pos[1]]
+        if cell == -1:
+            return None
+        return [cell // self.cols, cell % self.cols]
+
+    def find_path(self, start_pos, goal_pos, blocked_pos=None):
+        if self.stats is None:
+            return self._find_path(start_pos, goal_pos, blocked_pos)
+        return self.stats.measure(self, self._find_path, start_pos, goal_pos, blocked_pos)
+
+    def _find_path(self, start_pos, goal_pos, blocked_pos=None):
+
+        if start_pos == goal_pos:
+            return None
+
+        dist, next_hop = self.distance_field(goal_pos, blocked_pos)
+        cell = start_pos[0] * self.cols + start_pos[1]
+        if dist[cell] == -1:
+            return None
+
+        path = [list(start_pos)]
+        while dist[cell] > 0:
+            cell = next_hop[cell]
+            path.append([cell // self.cols, cell % self.cols])
+        return path
+
+class ArrayAStarPlanner:
+    """
+    A* on flat integer cell ids (r * cols + c).
+    g-costs, parents and visit marks live in preallocated arrays reused by every search;
+    a generation counter tells which entries belong to the current search, so nothing is cleared.
+    Expands nodes in the same order as AStarPlanner, so it returns the same paths.
+    """
+    def __init__(self, grid_rows, grid_cols, obstacles=None, profile=False):
+        self.rows = grid_rows
+        self.cols = grid_cols
+        self.obstacles = obstacles
+
+        size = self.rows * self.cols
+        self._g = array('i', [0]) * size
+        self._parent = array('i', [-1]) * size
+        self._visited = array('i', [0]) * size
+        self._generation = 0
+
+        # running totals, see PlannerStats
+        self.expanded = 0
+        self.pushed = 0
+        self.open_size = 0
+        self.stats = PlannerStats() if profile else None
+
+        self._row = array('i', [cell // self.cols for cell in range(size)])
+        self._col = array('i', [cell % self.cols for cell in range(size)])
+        # obstacles are static, so they are pruned once here
+        self._neighbors = build_neighbor_table(self.rows, self.cols, obstacles)
+
+    def heuristic(self, pos1, pos2):
+        # Manhattan distance
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    def to_index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def to_pos(self, cell):
+        return [cell // self.cols, cell % self.cols]
+
+    def find_path_indices(self, start, goal, blocked=-1):
+        """
+        start, goal, blocked: flat cell ids (blocked=-1 for none)
+        return the path as an int32 index array (start and goal included), or None
+        """
+        if self.stats is None:
+            return self._find_path_indices(start, goal, blocked)
+        return self.stats.measure(self, self._find_path_indices, start, goal, blocked)
+
+    def _find_path_indices(self, start, goal, blocked):
+        if start == goal:
+            return None
+
+        self._generation += 1
+        if self._generation >= 2**31 - 1:
+            self._visited = array('i', [0]) * (self.rows * self.cols)
+            self._generation = 1
+        generation = self._generation
+
+        g_cost = self._g
+        parent = self._parent
+        visited = self._visited
+        row = self._row
+        col = self._col
+        neighbors = self._neighbors
+        goal_r, goal_c = row[goal], col[goal]
+
+        g_cost[start] = 0
+        visited[start] = generation
+        priority_queue = [(0, 0, start)]
+        popped = 0
+        stale = 0
+
+        while priority_queue:
+            f, g, cell = heapq.heappop(priority_queue)
+            popped += 1
+
+            if cell == goal:
+                self._count(popped, stale, priority_queue)
+                # rebuilt path
+                path = [cell]
+                while cell != start:
+                    cell = parent[cell]
+                    path.append(cell)
+                return np.array(path[::-1], dtype=np.int32)
+
+            # stale heap entry, a shorter way to this cell was already expanded
+            if g > g_cost[cell]:
+                stale += 1
+                continue
+
+            new_g = g + 1
+            for n in neighbors[cell]:
+                if n == blocked:
+                    continue
+                if visited[n] != generation or new_g < g_cost[n]:
+                    visited[n] = generation
+                    g_cost[n] = new_g
+                    parent[n] = cell
+                    heapq.heappush(priority_queue, (new_g + abs(row[n] - goal_r) + abs(col[n] - goal_c), new_g, n))
+
+        self._count(popped, stale, priority_queue)
+        return None
+
+    def _count(self, popped, stale, priority_queue):
+        self.expanded += popped - stale
+        self.pushed += popped + len(priority_queue)
+        self.open_size = len(priority_queue)
+
+    def find_path(self, start_pos, goal_pos, blocked_pos=None):
+        blocked = self.to_index(blocked_pos) if blocked_pos else -1
+        path = self.find_path_indices(self.to_index(start_pos), self.to_index(goal_pos), blocked)
+        if path is None:
+            return None
+        return [[cell // self.cols, cell % self.cols] for cell in path.tolist()]
+
+class IncrementalAStarPlanner:
+    """
+    Incremental A* for a goal and a blocked cell that move a little between calls
+    (the idea of Fringe-Retrieving A*).
+    The cells expanded by earlier searches stay in a search tree rooted at the robot, with exact g-costs.
+    1. goal already in the tree below the robot: the path is read off the parent links, no search
+    2. otherwise the tree is repaired in one pass and A* continues from its fringe:
+       - the robot moved to a cell of the tree: keep the subtree below it, g-costs shift by the cost of that cell
+       - the blocked cell moved onto the tree: drop the subtree below it
+       - the old blocked cell is free again: drop the cells that could now get a shorter path through it
+    """
+    def __init__(self, grid_rows, grid_cols, obstacles=None, profile=False):
+        self.rows = grid_rows
+        self.cols = grid_cols
+        self.obstacles = obstacles
+
+        # running totals, see PlannerStats
+        self.expanded = 0
+        self.pushed = 0
+        self.open_size = 0
+        self.stats = PlannerStats() if profile else None
+
+        size = self.rows * self.cols
+        self._g = array('i', [0]) * size
+        self._parent = array('i', [-1]) * size
+        self._mark = array('i', [0]) * size     # == self._tree: the cell is in the search tree
+        self._tree = 0
+        self._cells = []                        # tree cells in expansion order (parents before children)
+        self._root = -1
+        self._blocked = -1                      # blocked cell the g-costs of the tree are exact for
+
+        self._row = array('i', [cell // self.cols for cell in range(size)])
+        self._col = array('i', [cell % self.cols for cell in range(size)])
+        self._neighbors = build_neighbor_table(self.rows, self.cols, obstacles)
+
+    def heuristic(self, pos1, pos2):
+        # Manhattan distance
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    def reset(self):
+        self._cells = []
+        self._root = -1
+        self._blocked = -1
+
+    def _manhattan(self, a, b):
+        return abs(self._row[a] - self._row[b]) + abs(self._col[a] - self._col[b])
+
+    def _next_tree(self):
+        self._tree += 1
+        if self._tree >= 2**31 - 1:
+            self._mark = array('i', [0]) * (self.rows * self.cols)
+            self._tree = 1
+        return self._tree
+
+    def _new_tree(self, start):
+        self._mark[start] = self._next_tree()
+        self._g[start] = 0
+        self._parent[start] = -1
+        self._cells = [start]
+        self._root = start
+
+    def _repair_tree(self, start, blocked):
+        """
+        keep the cells of the tree whose g-cost is still exact for the new start and blocked cell,
+        one pass in expansion order: a cell is kept only if its parent is kept
+        """
+        g = self._g
+        parent = self._parent
+        mark = self._mark
+        row = self._row
+        col = self._col
+        offset = g[start]
+
+        # a path through the freed cell is at least manhattan(start, freed) + manhattan(freed, cell) long
+        freed = self._blocked if self._blocked != blocked else -1
+        freed_r, freed_c = row[freed], col[freed]
+        start_to_freed = self._manhattan(start, freed) if freed != -1 else 0
+
+        tree = self._next_tree()
+        mark[start] = tree
+        g[start] = 0
+        parent[start] = -1
+        cells = [start]
+        for cell in self._cells:
+            p = parent[cell]
+            if cell == start or cell == blocked or p == -1 or mark[p] != tree:
+                continue
+            d = g[cell] - offset
+            if freed != -1 and d > start_to_freed + abs(row[cell] - freed_r) + abs(col[cell] - freed_c):
+                continue
+            g[cell] = d
+            mark[cell] = tree
+            cells.append(cell)
+        self._cells = cells
+        self._root = start
+
+    def _tree_path(self, start, goal, blocked):
+        """
+        path from start to goal along the parent links, or None if the tree cannot prove it is a shortest path
+        """
+        parent = self._parent
+        path = []
+        cell = goal
+        while cell != start:
+            if cell == -1 or cell == blocked:
+                return None
+            path.append(cell)
+            cell = parent[cell]
+        path.append(start)
+
+        freed = self._blocked
+        if freed != -1 and freed != blocked:
+            if self._g[goal] - self._g[start] > self._manhattan(start, freed) + self._manhattan(freed, goal):
+                return None
+        return [[cell // self.cols, cell % self.cols] for cell in reversed(path)]
+
+    def find_path(self, start_pos, goal_pos, blocked_pos=None):
+        if self.stats is None:
+            return self._find_path(start_pos, goal_pos, blocked_pos)
+        return self.stats.measure(self, self._find_path, start_pos, goal_pos, blocked_pos)
+
+    def _find_path(self, start_pos, goal_pos, blocked_pos=None):
+
+        if start_pos == goal_pos:
+            return None
+
+        start = start_pos[0] * self.cols + start_pos[1]
+        goal = goal_pos[0] * self.cols + goal_pos[1]
+        blocked = blocked_pos[0] * self.cols + blocked_pos[1] if blocked_pos else -1
+
+        # a blocked goal can never be reached (same as AStarPlanner), the tree is kept for the next call
+        if goal == blocked or (self.obstacles is not None and self.obstacles[goal_pos[0], goal_pos[1]]):
+            return None
+
+        tree = self._tree
+        mark = self._mark
+        if self._root != -1 and mark[start] == tree and mark[goal] == tree:
+            path = self._tree_path(start, goal, blocked)
+            if path is not None:
+                return path
+
+        if self._root == -1 or mark[start] != tree:
+            self._new_tree(start)
+        elif start != self._root or blocked != self._blocked:
+            self._repair_tree(start, blocked)
+        self._blocked = blocked
+
+        if self._mark[goal] != self._tree and not self._search(goal, blocked):
+            return None
+        return self._tree_path(start, goal, blocked)
+
+    def _search(self, goal, blocked):
+        """
+        continue A* from the fringe of the tree until the goal is expanded
+        """
+        g_cost = self._g
+        parent = self._parent
+        mark = self._mark
+        tree = self._tree
+        row = self._row
+        col = self._col
+        neighbors = self._neighbors
+        cells = self._cells
+        goal_r, goal_c = row[goal], col[goal]
+
+        # fringe: cells next to the tree, with their best g-cost through the tree
+        best = {}
+        for cell in cells:
+            new_g = g_cost[cell] + 1
+            for n in neighbors[cell]:
+                if mark[n] != tree and n != blocked and new_g < best.get(n, new_g + 1):
+                    best[n] = new_g
+                    parent[n] = cell
+        priority_queue = [(new_g + abs(row[n] - goal_r) + abs(col[n] - goal_c), new_g, n) for n, new_g in best.items()]
+        heapq.heapify(priority_queue)
+        popped = 0
+        expanded = 0
+
+        while priority_queue:
+            f, g, cell = heapq.heappop(priority_queue)
+            popped += 1
+            if mark[cell] == tree or g > best[cell]:
+                continue
+
+            mark[cell] = tree
+            g_cost[cell] = g
+            cells.append(cell)
+            expanded += 1
+            if cell == goal:
+                self._count(popped, expanded, priority_queue)
+                return True
+
+            new_g = g + 1
+            for n in neighbors[cell]:
+                if mark[n] != tree and n != blocked and new_g < best.get(n, new_g + 1):
+                    best[n] = new_g
+                    parent[n] = cell
+                    heapq.heappush(priority_queue, (new_g + abs(row[n] - goal_r) + abs(col[n] - goal_c), new_g, n))
+
+        self._count(popped, expanded, priority_queue)
+        return False
+
+    def _count(self, popped, expanded, priority_queue):
+        self.expanded += expanded
+        self.pushed += popped + len(priority_queue)
+        self.open_size = len(priority_queue)
+
+# planner modes selectable by name (RobotAgent(planner=...))
+PLANNERS = {
+    "astar": AStarPlanner,
+    "weighted_astar": partial(AStarPlanner, strategy="weighted"),
+    "jps": partial(AStarPlanner, strategy="jps"),
+    "bidirectional_bfs": partial(AStarPlanner, strategy="bidirectional"),
+    "distance_field": DistanceFieldPlanner,
+    "array_astar": ArrayAStarPlanner,
+    "incremental_astar": IncrementalAStarPlanner,
+}
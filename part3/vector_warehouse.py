@@ -0,0 +1,211 @@
+'''
+Batched Warehouse Robot simulator
+把上千個獨立任務 (mission) 存成 NumPy 陣列, 一次呼叫就推進全部任務:
+1. robot_positions: (num_envs, num_robots, 2)
+2. target_pos:      (num_envs, 2)
+3. steps / done:    (num_envs,)
+任務結束 (找到包裹或超過步數) 時會自動 reset 該任務 (per-mission autoreset)
+'''
+import numpy as np
+from warehouse_robot import WarehouseRobot, RobotAction
+
+# 動作對應的位移, index 就是 RobotAction 的值 (LEFT, DOWN, RIGHT, UP)
+ACTION_DELTAS = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]], dtype=np.int32)
+
+class VectorWarehouseRobot:
+    def __init__(self, num_envs, grid_rows=5, grid_cols=5, num_robots=2, max_steps=300, seed=None):
+        self.num_envs = num_envs
+        self.grid_rows = grid_rows
+        self.grid_cols = grid_cols
+        self.num_robots = num_robots
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        # 機器人起點, 和 WarehouseRobot 一樣: 0 號左上角, 1 號右下角, 其他沿著外圈排開
+        self.start_positions = np.array(WarehouseRobot(grid_rows, grid_cols, num_robots=num_robots).start_positions, dtype=np.int32)
+
+        self.robot_positions = np.zeros((num_envs, num_robots, 2), dtype=np.int32)
+        self.target_pos = np.zeros((num_envs, 2), dtype=np.int32)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+        重置 mask 為 True 的任務 (mask=None 代表全部)
+        """
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        idx = np.flatnonzero(mask)
+
+        self.robot_positions[idx] = self.start_positions
+        self.steps[idx] = 0
+        self.done[idx] = False
+
+        # 隨機產生包裹位置, 落在機器人腳下的重新抽
+        while idx.size > 0:
+            self.target_pos[idx, 0] = self.rng.integers(0, self.grid_rows, size=idx.size)
+            self.target_pos[idx, 1] = self.rng.integers(0, self.grid_cols, size=idx.size)
+            on_robot = np.any(np.all(self.robot_positions[idx] == self.target_pos[idx, None, :], axis=-1), axis=-1)
+            idx = idx[on_robot]
+
+    def perform_actions(self, robot_index, actions, active=None):
+        """
+        對所有任務同時執行 robot_index 號機器人的動作
+        actions: (num_envs,) 的 RobotAction 值
+        active: 只移動 active 為 True 的任務
+        回傳每個任務是否找到包裹
+        """
+        pos = self.robot_positions[:, robot_index]
+        new_pos = pos + ACTION_DELTAS[actions]
+
+        # 撞牆就留在原地
+        new_pos[:, 0] = np.clip(new_pos[:, 0], 0, self.grid_rows - 1)
+        new_pos[:, 1] = np.clip(new_pos[:, 1], 0, self.grid_cols - 1)
+        if active is not None:
+            new_pos = np.where(active[:, None], new_pos, pos)
+        self.robot_positions[:, robot_index] = new_pos
+
+        found = np.all(new_pos == self.target_pos, axis=-1)
+        if active is not None:
+            found &= active
+        return found
+
+    def step(self, actions):
+        """
+        推進一回合: 和 main.py 的 run_mission 一樣, 機器人依序移動,
+        一旦有機器人找到包裹, 後面的機器人在該任務就不再移動
+        actions: (num_envs, num_robots)
+        回傳 (finished, steps, hero), hero 為找到包裹的機器人編號 (-1 代表超時)
+        結束的任務會在回傳前自動 reset, self.done 記錄這一回合結束的任務
+        """
+        active = np.ones(self.num_envs, dtype=bool)
+        hero = np.full(self.num_envs, -1, dtype=np.int32)
+
+        for i in range(self.num_robots):
+            found = self.perform_actions(i, actions[:, i], active=active)
+            hero[found] = i
+            active &= ~found
+
+        self.steps += 1
+        finished = (hero >= 0) | (self.steps > self.max_steps)
+        steps = np.minimum(self.steps, self.max_steps)
+
+        self.reset(mask=finished)
+        self.done = finished
+        return finished, steps, hero
+
+def greedy_actions(positions, goals, blocked=None, rng=None):
+    """
+    一次算出所有任務的最短路徑動作 (空地圖上 Manhattan 距離就是最短路徑)
+    先走縱向, 被擋住就改走橫向, 兩個方向都被擋住就隨機移動
+    positions, goals, blocked: (num_envs, 2)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    num_envs = positions.shape[0]
+    diff = goals - positions
+
+    vertical = np.where(diff[:, 0] > 0, RobotAction.DOWN.value, RobotAction.UP.value)
+    horizontal = np.where(diff[:, 1] > 0, RobotAction.RIGHT.value, RobotAction.LEFT.value)
+    has_vertical = diff[:, 0] != 0
+    has_horizontal = diff[:, 1] != 0
+
+    if blocked is not None:
+        vertical_blocked = np.all(positions + ACTION_DELTAS[vertical] == blocked, axis=-1)
+        horizontal_blocked = np.all(positions + ACTION_DELTAS[horizontal] == blocked, axis=-1)
+    else:
+        vertical_blocked = horizontal_blocked = np.zeros(num_envs, dtype=bool)
+
+    actions = rng.integers(0, len(RobotAction), size=num_envs)
+    use_horizontal = has_horizontal & ~horizontal_blocked
+    actions[use_horizontal] = horizontal[use_horizontal]
+    use_vertical = has_vertical & ~vertical_blocked
+    actions[use_vertical] = vertical[use_vertical]
+
+    # 只剩一個方向而且被擋住: 往旁邊繞一步 (A* 也會多繞兩步)
+    detour_vertical = ~has_horizontal & vertical_blocked
+    actions[detour_vertical] = np.where(positions[detour_vertical, 1] > 0, RobotAction.LEFT.value, RobotAction.RIGHT.value)
+    detour_horizontal = ~has_vertical & horizontal_blocked
+    actions[detour_horizontal] = np.where(positions[detour_horizontal, 0] > 0, RobotAction.UP.value, RobotAction.DOWN.value)
+    return actions
+
+def collaboration_actions(env: VectorWarehouseRobot, rng=None):
+    """
+    Bot A 找包裹 (把 Bot B 當障礙), Bot B 距離包裹小於 5 步才去找包裹
+    和 BotTypeB 一樣, B 追 A 時 A 的位置本身就是障礙, 所以 A* 找不到路而隨機移動
+    """
+    if rng is None:
+        rng = env.rng
+    pos_a = env.robot_positions[:, 0]
+    pos_b = env.robot_positions[:, 1]
+    actions = np.empty((env.num_envs, 2), dtype=np.int64)
+    actions[:, 0] = greedy_actions(pos_a, env.target_pos, blocked=pos_b, rng=rng)
+
+    dist_to_target = np.abs(pos_b - env.target_pos).sum(axis=-1)
+    actions[:, 1] = rng.integers(0, len(RobotAction), size=env.num_envs)
+    near = dist_to_target < 5
+    actions[near, 1] = greedy_actions(pos_b[near], env.target_pos[near], blocked=pos_a[near], rng=rng)
+    return actions
+
+def solo_actions(env: VectorWarehouseRobot, rng=None):
+    """
+    只有 Bot A 找包裹, Bot B 一直往下 (停在右下角)
+    """
+    if rng is None:
+        rng = env.rng
+    actions = np.empty((env.num_envs, 2), dtype=np.int64)
+    actions[:, 0] = greedy_actions(env.robot_positions[:, 0], env.target_pos, rng=rng)
+    actions[:, 1] = RobotAction.DOWN.value
+    return actions
+
+def run_vector_trials(policy, num_missions, grid_rows, grid_cols, max_steps=300, num_envs=1024, seed=None):
+    """
+    用 num_envs 個平行任務跑完 num_missions 個任務
+    每個任務位置只會在還有任務沒開始時才 autoreset, 避免只統計到短任務
+    """
+    num_envs = min(num_envs, num_missions)
+    env = VectorWarehouseRobot(num_envs, grid_rows=grid_rows, grid_cols=grid_cols, max_steps=max_steps, seed=seed)
+
+    started = num_envs
+    active = np.ones(num_envs, dtype=bool)
+    all_steps = []
+    heroes = []
+
+    while active.any():
+        finished, steps, hero = env.step(policy(env))
+        finished = finished & active
+        all_steps.append(steps[finished])
+        heroes.append(hero[finished])
+
+        # 任務數量用完的位置不再計入
+        n_finished = int(finished.sum())
+        restart = min(n_finished, num_missions - started)
+        stop = np.flatnonzero(finished)[restart:]
+        active[stop] = False
+        started += restart
+
+    all_steps = np.concatenate(all_steps)
+    heroes = np.concatenate(heroes)
+    total_steps = int(all_steps.sum())
+    return {
+        "total_steps": total_steps,
+        "avg_steps": total_steps / num_missions if num_missions > 0 else 0,
+        "timeouts": int(np.sum(all_steps == max_steps)),
+        "heroes": np.bincount(heroes[heroes >= 0], minlength=2),
+    }
+
+if __name__ == "__main__":
+    import time
+
+    MAX_MISSIONS = 1000
+    MAX_STEPS_PER_MISSION = 300
+
+    # 掃過不同大小的地圖
+    for size in [5, 10, 20, 50, 100]:
+        start = time.perf_counter()
+        collaboration = run_vector_trials(collaboration_actions, MAX_MISSIONS, size, size, max_steps=MAX_STEPS_PER_MISSION, seed=0)
+        solo = run_vector_trials(solo_actions, MAX_MISSIONS, size, size, max_steps=MAX_STEPS_PER_MISSION, seed=0)
+        elapsed = time.perf_counter() - start
+        print(f"MAP {size}*{size} | Collaboration Avg Steps: {collaboration['avg_steps']:.2f} (Timeouts: {collaboration['timeouts']})"
+              f" | Solo Avg Steps: {solo['avg_steps']:.2f} (Timeouts: {solo['timeouts']}) | {elapsed:.2f}s")
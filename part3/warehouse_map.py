@@ -0,0 +1,71 @@
+'''
+Warehouse Map - 靜態障礙物 (貨架, 牆, 走道)
+地圖檔每一行代表一排格子:
+.  走道 / 地板 (可以走)
+S  貨架 (shelf, 障礙物)
+#  牆 (wall, 障礙物)
+空白行會被忽略
+
+occupancy 是 (grid_rows, grid_cols) 的 bool 陣列, True 代表不能走
+環境、規劃器和畫面共用同一個陣列 (不複製)
+'''
+import numpy as np
+
+FLOOR = "."
+SHELF = "S"
+WALL = "#"
+
+# tiles 陣列裡的編號
+TILE_CODES = {FLOOR: 0, SHELF: 1, WALL: 2}
+TILE_CHARS = {code: char for char, code in TILE_CODES.items()}
+
+class WarehouseMap:
+    def __init__(self, lines):
+        lines = [line.strip() for line in lines if line.strip()]
+        if not lines:
+            raise ValueError("warehouse map is empty")
+
+        self.grid_rows = len(lines)
+        self.grid_cols = len(lines[0])
+        for r, line in enumerate(lines):
+            if len(line) != self.grid_cols:
+                raise ValueError(f"warehouse map row {r} has {len(line)} cells, expected {self.grid_cols}")
+            for char in line:
+                if char not in TILE_CODES:
+                    raise ValueError(f"unknown warehouse map tile {char!r} in row {r}")
+
+        self.tiles = np.array([[TILE_CODES[char] for char in line] for line in lines], dtype=np.uint8)
+        self.occupancy = self.tiles != TILE_CODES[FLOOR]
+
+    @classmethod
+    def from_file(cls, filename):
+        with open(filename, "r") as f:
+            return cls(f.read().splitlines())
+
+    def to_lines(self):
+        return ["".join(TILE_CHARS[code] for code in row) for row in self.tiles.tolist()]
+
+    def save(self, filename):
+        with open(filename, "w") as f:
+            f.write("\n".join(self.to_lines()) + "\n")
+
+    def is_free(self, pos):
+        return 0 <= pos[0] < self.grid_rows and 0 <= pos[1] < self.grid_cols and not self.occupancy[pos[0], pos[1]]
+
+    def free_cells(self):
+        return [[int(r), int(c)] for r, c in np.argwhere(~self.occupancy)]
+
+def generate_warehouse_map(grid_rows, grid_cols, shelf_length=4):
+    """
+    產生一個簡單的倉庫: 外圈是走道, 每隔一排放一排貨架,
+    貨架每 shelf_length 格留一格橫向走道
+    """
+    lines = []
+    for r in range(grid_rows):
+        line = []
+        for c in range(grid_cols):
+            is_shelf_row = 2 <= r < grid_rows - 2 and r % 2 == 0
+            is_shelf_col = 1 <= c < grid_cols - 1 and (c - 1) % (shelf_length + 1) < shelf_length
+            line.append(SHELF if is_shelf_row and is_shelf_col else FLOOR)
+        lines.append("".join(line))
+    return WarehouseMap(lines)
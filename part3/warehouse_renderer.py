@@ -0,0 +1,152 @@
+'''
+Warehouse Robot Renderer
+這個檔案負責管理：
+1. 畫布 (Pygame)
+2. 把 WarehouseRobot 的狀態畫出來
+WarehouseRobot 本身不依賴 pygame, 只有呼叫 render() 時才會建立這個物件
+render_mode "human" 畫在視窗上, "rgb_array" 畫在記憶體裡的 surface (不開視窗, 沒有螢幕的機器也能用),
+render() 回傳 (height, width, 3) 的 uint8 NumPy 畫面, 可以給 gymnasium.wrappers.RecordVideo 錄影
+'''
+import pygame
+import numpy as np
+import sys
+from os import path
+
+# 貨架和牆沒有圖片, 直接畫色塊 (index 是 warehouse_map 的 tile 編號)
+TILE_COLORS = {1: (139, 90, 43), 2: (80, 80, 80)}
+
+RENDER_MODES = ("human", "rgb_array")
+
+_fonts = {}
+
+def get_font(size=20):
+    # font objects die with pygame.quit() (e.g. another renderer closed its window), they are created again after it
+    if size not in _fonts:
+        pygame.font.init()
+        if not _fonts:
+            pygame.register_quit(_fonts.clear)
+        _fonts[size] = pygame.font.SysFont("Arial", size)
+    return _fonts[size]
+
+class WarehouseRenderer:
+    def __init__(self, warehouse, fps=10, render_mode="human"):
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"unknown render mode {render_mode!r}, expected one of {RENDER_MODES}")
+        self.warehouse = warehouse
+        self.fps = fps
+        self.render_mode = render_mode
+        self._init_pygame()
+
+    def _init_pygame(self):
+        if self.render_mode == "human":
+            pygame.init()
+            pygame.display.init()
+        else:
+            # offscreen: only the font module (get_font), no video driver
+            pygame.font.init()
+        self.clock = pygame.time.Clock()
+
+        self.cell_height = 64
+        self.cell_width = 64
+        self.window_size = (self.cell_width * self.warehouse.grid_cols, self.cell_height * self.warehouse.grid_rows + 50)
+        if self.render_mode == "human":
+            self.window_surface = pygame.display.set_mode(self.window_size) 
+        else:
+            # offscreen, no display needed
+            self.window_surface = pygame.Surface(self.window_size)
+
+        # 載入圖片 (確保 sprites 資料夾存在且有這些圖)
+        img_path = path.join(path.dirname(__file__), "sprites")
+        try:
+            # 載入並縮放圖片
+            self.robot_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "bot_blue.png")), (64, 64))
+            self.floor_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "floor.png")), (64, 64))
+            self.goal_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "package.png")), (64, 64))
+        except Exception as e:
+            print(f"圖片載入失敗，請檢查 sprites 資料夾: {e}")
+            sys.exit()
+
+        self._build_background()
+        # cells drawn on top of the background in the last frame (robots, package), redrawn from the background next frame
+        self._drawn_cells = set()
+        self._full_redraw = True
+
+    def _build_background(self):
+        # 地板和障礙物不會動, 只畫一次到背景 surface, 之後每一格都從這裡複製
+        warehouse = self.warehouse
+        self.background = pygame.Surface(self.window_size)
+        self.background.fill((255, 255, 255))
+        tiles = warehouse.warehouse_map.tiles if warehouse.warehouse_map is not None else None
+        for r in range(warehouse.grid_rows):
+            for c in range(warehouse.grid_cols):
+                pos = (c * self.cell_width, r * self.cell_height)
+                self.background.blit(self.floor_img, pos)
+                if tiles is not None and tiles[r, c] in TILE_COLORS:
+                    pygame.draw.rect(self.background, TILE_COLORS[tiles[r, c]], (pos[0], pos[1], self.cell_width, self.cell_height))
+        self.info_rect = pygame.Rect(0, self.cell_height * warehouse.grid_rows, self.window_size[0], self.window_size[1] - self.cell_height * warehouse.grid_rows)
+
+    def _cell_rect(self, cell):
+        return pygame.Rect(cell[1] * self.cell_width, cell[0] * self.cell_height, self.cell_width, self.cell_height)
+
+    def render(self, info_text=""):
+        """
+        dirty rectangles: only the cells of the robots / package (this frame and the last one) and the info bar
+        are copied from the background, redrawn and sent to the display
+        rgb_array mode returns the frame as a (height, width, 3) uint8 array instead
+        """
+        if self.render_mode == "human":
+            self._process_events()
+        warehouse = self.warehouse
+        surface = self.window_surface
+
+        cells = {tuple(pos) for pos in warehouse.robot_positions}
+        cells.add(tuple(warehouse.target_pos))
+
+        if self._full_redraw:
+            surface.blit(self.background, (0, 0))
+            dirty = [surface.get_rect()]
+        else:
+            dirty = [self._cell_rect(cell) for cell in self._drawn_cells | cells]
+            for rect in dirty:
+                surface.blit(self.background, rect, rect)
+            surface.blit(self.background, self.info_rect, self.info_rect)
+            dirty.append(self.info_rect)
+
+        # 1. 畫包裹
+        surface.blit(self.goal_img, self._cell_rect(warehouse.target_pos))
+
+        # 2. 畫所有機器人
+        for i, pos in enumerate(warehouse.robot_positions):
+            pixel_pos = self._cell_rect(pos).topleft
+            surface.blit(self.robot_img, pixel_pos)
+            
+            # 標記 P1, P2 以示區別
+            label = get_font().render(f"P{i+1}", True, (255, 0, 0)) # 紅色字
+            surface.blit(label, pixel_pos)
+
+        # 3. 顯示底部資訊
+        text_surf = get_font().render(info_text, True, (0, 0, 0))
+        surface.blit(text_surf, (10, self.window_size[1] - 40))
+
+        self._drawn_cells = cells
+        self._full_redraw = False
+        if self.render_mode == "rgb_array":
+            # row-major RGB bytes, several times faster than transposing surfarray.array3d
+            frame = np.frombuffer(bytearray(pygame.image.tobytes(surface, "RGB")), dtype=np.uint8)
+            return frame.reshape(self.window_size[1], self.window_size[0], 3)
+        pygame.display.update(dirty)
+        self.clock.tick(self.fps)
+
+    def close(self):
+        # offscreen renderers have no window to close, pygame keeps running for the other renderers
+        if self.render_mode == "human":
+            pygame.quit()
+
+    def _process_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # 視窗被遮住又露出來時, 下一張整個重畫
+                self._full_redraw = True
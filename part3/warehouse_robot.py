@@ -1,14 +1,12 @@
 '''
 Warehouse Robot Environment - Multi-Robot Collaboration Version
 這個檔案負責管理：
-1. 畫布 (Pygame)
+1. 地圖大小、靜態障礙物 (warehouse_map.py) 與包裹位置
 2. 多個機器人的位置與移動規則
+畫面 (Pygame) 放在 warehouse_renderer.py, 只有需要 render 時才會載入
 '''
-import random
+import numpy as np
 from enum import Enum
-import pygame
-import sys
-from os import path
 
 # 定義動作 (上下左右)
 class RobotAction(Enum):
@@ -24,47 +22,87 @@ class GridTile(Enum):
     TARGET=2
 
 class WarehouseRobot:
-    def __init__(self, grid_rows=5, grid_cols=5, fps=10):
+    def __init__(self, grid_rows=5, grid_cols=5, fps=10, render=False, warehouse_map=None, num_robots=2, seed=None, render_mode="human"):
+        # 有地圖時, 地圖大小以地圖為準
+        self.warehouse_map = warehouse_map
+        if warehouse_map is not None:
+            grid_rows, grid_cols = warehouse_map.grid_rows, warehouse_map.grid_cols
+            self.obstacles = warehouse_map.occupancy
+            self.free_cells = warehouse_map.free_cells()
+        else:
+            self.obstacles = None
+            self.free_cells = None
+
         self.grid_rows = grid_rows
         self.grid_cols = grid_cols
         self.fps = fps
-        self._init_pygame()
+        # "human" (window) or "rgb_array" (offscreen, render() returns the frame)
+        self.render_mode = render_mode
+        self.num_robots = num_robots
+        # 每個環境自己的亂數產生器, 不用全域的 random, reset(seed=...) 可以重現同一個任務
+        self.rng = np.random.default_rng(seed)
+        self.start_positions = self._start_positions()
+        self.renderer = None
+        if render:
+            self.attach_renderer()
         self.reset()
 
-    def _init_pygame(self):
-        pygame.init()
-        pygame.display.init()
-        self.clock = pygame.time.Clock()
-        self.action_font = pygame.font.SysFont("Arial", 20) 
-
-        self.cell_height = 64
-        self.cell_width = 64
-        self.window_size = (self.cell_width * self.grid_cols, self.cell_height * self.grid_rows + 50)
-        self.window_surface = pygame.display.set_mode(self.window_size) 
-
-        # 載入圖片 (確保 sprites 資料夾存在且有這些圖)
-        img_path = path.join(path.dirname(__file__), "sprites")
-        try:
-            # 載入並縮放圖片
-            self.robot_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "bot_blue.png")), (64, 64))
-            self.floor_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "floor.png")), (64, 64))
-            self.goal_img = pygame.transform.scale(pygame.image.load(path.join(img_path, "package.png")), (64, 64))
-        except Exception as e:
-            print(f"圖片載入失敗，請檢查 sprites 資料夾: {e}")
-            sys.exit()
-
-    def reset(self):
-        # 初始化兩個機器人的位置 (協作模式)
+    def attach_renderer(self):
+        # 延遲載入 pygame, 實驗模式 (沒有螢幕的機器) 完全不需要 pygame
+        from warehouse_renderer import WarehouseRenderer
+        self.renderer = WarehouseRenderer(self, fps=self.fps, render_mode=self.render_mode)
+        return self.renderer
+
+    def _start_positions(self):
         # 機器人 0: 左上角 (0,0)
         # 機器人 1: 右下角 (最底, 最右)
-        self.robot_positions = [
-            [0, 0], 
-            [self.grid_rows-1, self.grid_cols-1]
-        ]
-
-        # 隨機產生包裹位置
+        # 其他機器人 (N-robot 模式) 沿著地圖外圈平均排開, 外圈不夠再放到內部
+        positions = [[0, 0], [self.grid_rows-1, self.grid_cols-1]][:self.num_robots]
+        if self.obstacles is not None:
+            for pos in positions:
+                if self.obstacles[pos[0], pos[1]]:
+                    raise ValueError(f"robot start position {pos} is blocked in the warehouse map")
+        if self.num_robots <= 2:
+            return positions
+
+        rows, cols = self.grid_rows, self.grid_cols
+        ring = [[0, c] for c in range(cols)] + [[r, cols-1] for r in range(1, rows)] \
+            + [[rows-1, c] for c in range(cols-2, -1, -1)] + [[r, 0] for r in range(rows-2, 0, -1)]
+        interior = [[r, c] for r in range(1, rows-1) for c in range(1, cols-1)]
+
+        def usable(cells):
+            return [pos for pos in cells if pos not in positions and (self.obstacles is None or not self.obstacles[pos[0], pos[1]])]
+
+        ring = usable(ring)
+        extra = self.num_robots - len(positions)
+        if extra <= len(ring):
+            step = len(ring) / extra
+            return positions + [ring[int(k * step)] for k in range(extra)]
+
+        candidates = ring + usable(interior)
+        # 至少留一格給包裹
+        if extra >= len(candidates):
+            raise ValueError(f"not enough free cells for {self.num_robots} robots")
+        return positions + candidates[:extra]
+
+    def reset(self, seed=None, target_pos=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        # 初始化機器人的位置 (協作模式為兩個機器人)
+        self.robot_positions = [pos.copy() for pos in self.start_positions]
+
+        # 指定包裹位置 (例如 gym 環境用自己的亂數產生器抽)
+        if target_pos is not None:
+            self.target_pos = list(target_pos)
+            return
+
+        # 隨機產生包裹位置 (有地圖時只放在走道上)
         while True:
-            self.target_pos = [random.randint(0, self.grid_rows-1), random.randint(0, self.grid_cols-1)]
+            if self.free_cells is not None:
+                self.target_pos = list(self.free_cells[self.rng.integers(len(self.free_cells))])
+            else:
+                self.target_pos = [int(self.rng.integers(self.grid_rows)), int(self.rng.integers(self.grid_cols))]
             # 確保包裹不會剛好生成在機器人腳下
             if self.target_pos not in self.robot_positions:
                 break
@@ -72,7 +110,7 @@ class WarehouseRobot:
     def perform_action(self, robot_index, action: RobotAction):
         """
         執行指定機器人的動作
-        robot_index: 0 或 1 (代表哪一隻機器人)
+        robot_index: 0 ~ num_robots-1 (代表哪一隻機器人)
         """
         current_pos = self.robot_positions[robot_index]
         new_pos = current_pos.copy()
@@ -86,6 +124,10 @@ class WarehouseRobot:
             new_pos[0] -= 1
         elif action == RobotAction.DOWN and current_pos[0] < self.grid_rows - 1:
             new_pos[0] += 1
+
+        # 撞到貨架或牆就留在原地
+        if self.obstacles is not None and self.obstacles[new_pos[0], new_pos[1]]:
+            new_pos = current_pos.copy()
         
         # 更新該機器人的位置
         self.robot_positions[robot_index] = new_pos
@@ -96,35 +138,12 @@ class WarehouseRobot:
         return False
 
     def render(self, info_text=""):
-        self._process_events()
-        self.window_surface.fill((255, 255, 255))
-
-        # 1. 畫地板和包裹
-        for r in range(self.grid_rows):
-            for c in range(self.grid_cols):
-                pos = (c * self.cell_width, r * self.cell_height)
-                self.window_surface.blit(self.floor_img, pos)
-                if [r, c] == self.target_pos:
-                    self.window_surface.blit(self.goal_img, pos)
-
-        # 2. 畫所有機器人
-        for i, pos in enumerate(self.robot_positions):
-            pixel_pos = (pos[1] * self.cell_width, pos[0] * self.cell_height)
-            self.window_surface.blit(self.robot_img, pixel_pos)
-            
-            # 標記 P1, P2 以示區別
-            label = self.action_font.render(f"P{i+1}", True, (255, 0, 0)) # 紅色字
-            self.window_surface.blit(label, pixel_pos)
-
-        # 3. 顯示底部資訊
-        text_surf = self.action_font.render(info_text, True, (0, 0, 0))
-        self.window_surface.blit(text_surf, (10, self.window_size[1] - 40))
-
-        pygame.display.update()
-        self.clock.tick(self.fps)
-
-    def _process_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
\ No newline at end of file
+        # 第一次 render 時才建立視窗; rgb_array 模式回傳畫面
+        if self.renderer is None:
+            self.attach_renderer()
+        return self.renderer.render(info_text)
+
+    def close(self):
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None